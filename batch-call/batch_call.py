@@ -1,6 +1,17 @@
 import openpyxl
+import base64
 import csv
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import pickle
 import subprocess
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 
 def extract_arg_dicts_from_xlsx(xlsx_path):
@@ -48,23 +59,451 @@ def extract_arg_dicts_from_csv(csv_path):
         for row in reader:
             arg_dicts.append(row)
     return arg_dicts
+
+def _to_bool(value):
+    """Convert spreadsheet values like True, 1, "yes" or "false" to a bool."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "yes", "y", "1", "1.0"):
+        return True
+    if text in ("false", "no", "n", "0", "0.0"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+def _to_int(value):
+    """Convert to int, accepting whole-number floats such as 12.0 (how Excel stores 12)."""
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"not a whole number: {value!r}")
+    return int(number)
+
+_COLUMN_TYPES = {"int": _to_int, int: _to_int, "float": float, float: float,
+                 "bool": _to_bool, bool: _to_bool, "str": str, str: str}
+
+def _make_row_converter(source, headers, types, required):
+    """
+    Check the header row against the schema and return a function that converts one row.
+    
+    Raises:
+        ValueError: If a required or typed column is missing from the header row.
+    """
+    types = dict(types or {})
+    required = list(required or [])
+    missing = [column for column in list(required) + list(types) if column not in headers]
+    if missing:
+        raise ValueError(f"{source}: missing columns {missing} (found {headers})")
+    converters = {column: _COLUMN_TYPES.get(kind, kind) for column, kind in types.items()}
+
+    def convert(row_number, kwargs):
+        for column in required:
+            if kwargs.get(column) in (None, ""):
+                raise ValueError(f"{source}, row {row_number}: '{column}' is empty")
+        for column, converter in converters.items():
+            value = kwargs.get(column)
+            if value in (None, ""):
+                kwargs[column] = None
+                continue
+            try:
+                kwargs[column] = converter(value)
+            except (TypeError, ValueError) as error:
+                raise ValueError(f"{source}, row {row_number}: bad value for '{column}': {error}") from None
+        return kwargs
+
+    return convert
+
+def _iter_xlsx_rows(xlsx_path, cached_values=False, skip_empty_rows=False):
+    """
+    Yield the header row of an Excel file, then (row number, values) for each data row.
+    
+    The workbook is streamed in read-only mode. Formula cells hold the formula text, like
+    extract_arg_dicts_from_xlsx returns, unless cached_values is True.
+    """
+    workbook = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=cached_values)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = list(next(rows, ()))
+        yield headers
+        for row_number, row in enumerate(rows, start=2):
+            if skip_empty_rows and all(value in (None, "") for value in row):
+                continue
+            yield row_number, row
+    finally:
+        workbook.close()
+
+def _iter_csv_rows(csv_path, skip_empty_rows=False):
+    """
+    Yield the header row of a CSV file, then (row number, values) for each data row.
+    
+    Blank lines are skipped like csv.DictReader does; rows of empty cells only with skip_empty_rows.
+    """
+    with open(csv_path, newline='', encoding='utf-8-sig') as csvfile:
+        reader = csv.reader(csvfile)
+        headers = next(reader, [])
+        yield headers
+        for row_number, row in enumerate(reader, start=2):
+            if not row or (skip_empty_rows and not any(value.strip() for value in row)):
+                continue
+            yield row_number, row
+
+def _row_dict(headers, row):
+    """
+    Pair headers with row values like csv.DictReader: short rows are padded with None and
+    values beyond the last header are kept as a list under the None key.
+    """
+    kwargs = {header: (row[i] if i < len(row) else None) for i, header in enumerate(headers)}
+    if len(row) > len(headers):
+        kwargs[None] = list(row[len(headers):])
+    return kwargs
+
+def _iter_arg_dicts(source, rows, types, required, prevalidate):
+    headers = next(rows)
+    convert = _make_row_converter(source, headers, types, required)
+    if prevalidate:
+        # Stream through the whole file once so bad rows fail before any job runs
+        for row_number, row in rows:
+            convert(row_number, _row_dict(headers, row))
+        return None
+
+    def generate():
+        for row_number, row in rows:
+            yield convert(row_number, _row_dict(headers, row))
+
+    return generate()
+
+def iter_arg_dicts_from_xlsx(xlsx_path, types=None, required=None, prevalidate=False, cached_values=False,
+                             skip_empty_rows=False):
+    """
+    Lazily read argument dictionaries from an Excel file, one row at a time.
+    
+    The workbook is opened in read-only (streaming) mode, so jobs can start on the first row
+    of a large sheet before the rest of it has been read. By default the rows are the same as
+    extract_arg_dicts_from_xlsx returns (formula text, empty rows included).
+    
+    Args:
+        xlsx_path (str): The file path to the Excel (.xlsx) file containing parameter data.
+                         The file should have parameter names in the first row as headers,
+                         with each subsequent row representing a set of parameters.
+        types (dict): Optional column types, e.g. {"ratio": float, "batch_size": "int", "f0": bool}.
+                      Types can be int, float, bool, str (or their names) or any callable.
+                      Empty cells become None.
+        required (list): Optional columns that must exist and must not be empty in any row.
+        prevalidate (bool): If True, check every row before the first one is returned, so a bad
+                            value anywhere in the sheet fails before any job runs.
+        cached_values (bool): If True, formula cells hold the value Excel cached when it saved
+                              the file instead of the formula text. Files saved by other tools
+                              (e.g. openpyxl) may have no cached values; those cells are None.
+        skip_empty_rows (bool): If True, skip rows whose cells are all empty.
+    
+    Returns:
+        generator: Yields one dictionary of parameter names and values per row.
+    
+    Raises:
+        ValueError: Immediately if a required or typed column is missing; when the row is
+                    reached (or immediately with prevalidate=True) if a value is empty or
+                    cannot be converted. The message names the row.
+    """
+    if prevalidate:
+        _iter_arg_dicts(xlsx_path, _iter_xlsx_rows(xlsx_path, cached_values, skip_empty_rows), types, required,
+                        prevalidate=True)
+    return _iter_arg_dicts(xlsx_path, _iter_xlsx_rows(xlsx_path, cached_values, skip_empty_rows), types, required,
+                           prevalidate=False)
+
+def iter_arg_dicts_from_csv(csv_path, types=None, required=None, prevalidate=False, skip_empty_rows=False):
+    """
+    Lazily read argument dictionaries from a UTF-8 CSV file, one row at a time.
+    
+    By default the rows are the same as extract_arg_dicts_from_csv returns: strings, blank
+    lines skipped, short rows padded with None and extra values listed under the None key.
+    
+    Args:
+        csv_path (str): The file path to the CSV file containing parameter data.
+                        The file should have parameter names in the first row as headers,
+                        with each subsequent row representing a set of parameters.
+        types (dict): Optional column types, e.g. {"ratio": float, "batch_size": "int", "f0": bool}.
+                      Types can be int, float, bool, str (or their names) or any callable.
+                      Empty cells become None.
+        required (list): Optional columns that must exist and must not be empty in any row.
+        prevalidate (bool): If True, check every row before the first one is returned.
+        skip_empty_rows (bool): If True, also skip rows whose cells are all empty (e.g. ",,").
+    
+    Returns:
+        generator: Yields one dictionary of parameter names and values per row.
+    
+    Raises:
+        ValueError: See iter_arg_dicts_from_xlsx.
+    """
+    if prevalidate:
+        _iter_arg_dicts(csv_path, _iter_csv_rows(csv_path, skip_empty_rows), types, required, prevalidate=True)
+    return _iter_arg_dicts(csv_path, _iter_csv_rows(csv_path, skip_empty_rows), types, required, prevalidate=False)
+
 #--------
 
-def cli_call(base_cmd, arg_dict):
+def _normalize_arg(value):
+    """Strip string values and stringify scalars, recursing into dicts, lists and tuples."""
+    if isinstance(value, dict):
+        return {str(k): _normalize_arg(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_arg(v) for v in value]
+    return str(value).strip()
+
+
+def _arg_strings(value):
+    """Yield every string in a normalized argument, e.g. the "path" values of a list of dicts."""
+    if isinstance(value, dict):
+        for v in value.values():
+            yield from _arg_strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _arg_strings(v)
+    else:
+        yield value
+
+
+class JobJournal:
     """
-    Run a command-line tool with parameters from a dictionary.
+    Record of finished batch jobs, used to skip unchanged rows when a batch is run again.
+    
+    Each line of the journal file is a JSON object holding a job's normalized arguments, the size,
+    mtime and SHA-256 hash of each of its input files, its output paths and its result or exit
+    status. A job is skipped when a successful entry exists for the same arguments, none of the
+    input files have changed and all of the outputs still exist.
+    
+    Args:
+        path (str): The journal file (JSON lines). It is created if it does not exist.
+        input_columns (list): Parameter names whose values are input files, e.g. ["model", "audio"].
+                              Default: every parameter whose value is an existing file,
+                              except the output columns. Dict and list values are searched
+                              recursively, e.g. {"models": [{"path": "a.pth"}, ...]}.
+        output_columns (list): Parameter names whose values are output files.
+                               Default: every parameter with "output" in its name.
+        pickle_results (bool): Also store results that JSON would change (tuples, arrays, custom
+                               objects) pickled, so skipped jobs return them unchanged. Only
+                               enable this for journals nobody else can write to: loading a
+                               pickled result runs code chosen by whoever wrote the journal.
+                               By default skipped jobs return the JSON form (lists instead of
+                               tuples) or the repr() of the result.
+    """
+
+    def __init__(self, path, input_columns=None, output_columns=None, pickle_results=False):
+        self.path = path
+        self.input_columns = input_columns
+        self.output_columns = output_columns
+        self.pickle_results = pickle_results
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # e.g. a line cut short when the previous run died
+                    self.entries[entry["key"]] = entry
+                    for file_path, stat in entry.get("inputs", {}).items():
+                        self._stats[file_path] = stat
+
+    def _file_stat(self, file_path):
+        """Return size, mtime and content hash of a file, rehashing only if size or mtime changed."""
+        st = os.stat(file_path)
+        known = self._stats.get(file_path)
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha256.update(chunk)
+        stat = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256.hexdigest()}
+        self._stats[file_path] = stat
+        return stat
+
+    def prepare(self, arg_dict):
+        """
+        Describe a job: its key, normalized arguments, input file hashes and output paths.
+        
+        Args:
+            arg_dict (dict): The job's parameters
+        
+        Returns:
+            dict: The job description to pass to completed() and record().
+        """
+        args = _normalize_arg(arg_dict)
+        if self.output_columns is None:
+            output_columns = [k for k in args if "output" in k.lower()]
+        else:
+            output_columns = [k for k in self.output_columns if k in args]
+        if self.input_columns is None:
+            input_columns = [k for k in args if k not in output_columns]
+        else:
+            input_columns = [k for k in self.input_columns if k in args]
+
+        key = hashlib.sha256(json.dumps(args, sort_keys=True).encode("utf-8")).hexdigest()
+        inputs = {
+            value: self._file_stat(value)
+            for k in input_columns for value in _arg_strings(args[k]) if os.path.isfile(value)
+        }
+        outputs = [value for k in output_columns for value in _arg_strings(args[k])]
+        return {"key": key, "args": args, "inputs": inputs, "outputs": outputs}
+
+    def completed(self, job):
+        """Return the journal entry if the job already succeeded with the same inputs, else None."""
+        entry = self.entries.get(job["key"])
+        if entry is None or entry["status"] != "ok":
+            return None
+        if {p: s["sha256"] for p, s in entry["inputs"].items()} != {p: s["sha256"] for p, s in job["inputs"].items()}:
+            return None
+        if not all(os.path.exists(output) for output in entry["outputs"]):
+            return None
+        return entry
+
+    def result(self, entry):
+        """
+        Return the result recorded in a journal entry.
+        
+        Pickled results are only loaded when the journal was opened with pickle_results=True.
+        """
+        if self.pickle_results and "result_pickle" in entry:
+            try:
+                return pickle.loads(base64.b64decode(entry["result_pickle"]))
+            except Exception:
+                pass  # e.g. the result's class no longer exists; fall back to the JSON form
+        return entry["result"]
+
+    def record(self, job, status, result=None):
+        """
+        Append a finished job to the journal.
+        
+        Args:
+            job (dict): The job description from prepare()
+            status (str): "ok" or "failed"
+            result: The function's return value or the command's exit status. It is stored as
+                    JSON (or its repr() if it cannot be). With pickle_results, values that JSON
+                    would change are also stored pickled so result() can give them back unchanged.
+        """
+        try:
+            stored = json.loads(json.dumps(result))
+        except (TypeError, ValueError):
+            stored = repr(result)
+        entry = dict(job, status=status, result=stored, time=time.time())
+        try:
+            unchanged = type(stored) is type(result) and bool(stored == result)
+        except Exception:
+            unchanged = False  # e.g. arrays, whose == is elementwise
+        if self.pickle_results and not unchanged:
+            try:
+                entry["result_pickle"] = base64.b64encode(pickle.dumps(result)).decode("ascii")
+            except Exception:
+                pass  # keep the JSON form only
+        with self._lock:
+            self.entries[job["key"]] = entry
+            with open(self.path, "a", encoding="utf-8") as journal_file:
+                journal_file.write(json.dumps(entry) + "\n")
+
+
+def _open_journal(journal):
+    """Accept a JobJournal, a journal file path or None."""
+    if journal is None or isinstance(journal, JobJournal):
+        return journal
+    return JobJournal(journal)
+
+
+class JobTimings:
+    """
+    Per-job timing log of a batch run, one row per finished job.
+    
+    Each row holds the job "index" (0-based position in arg_dicts), the function name or command
+    "name", its "status" ("ok", "failed" or "skipped"), the wall-clock "start" time, "seconds"
+    taken, "attempts", the "error" (empty on success) and the job's "args" as JSON.
+    
+    Args:
+        path (str): Output file. A .csv file can be opened directly in a spreadsheet; any other
+                    extension is written as JSON lines. Rows are appended and flushed as jobs
+                    finish, so an interrupted run keeps the timings of the jobs it completed.
+    """
+
+    FIELDS = ["index", "name", "status", "start", "seconds", "attempts", "error", "args"]
+
+    def __init__(self, path):
+        self.path = path
+        self._csv = path.lower().endswith(".csv")
+        self._lock = threading.Lock()
+        if self._csv and not os.path.exists(path):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(self.FIELDS)
+
+    def record(self, index, name, args, status, start, seconds, error=None, attempts=1):
+        """
+        Append one finished job.
+        
+        Args:
+            index (int): Position of the job in arg_dicts
+            name (str): Function name or command line
+            args (dict): The job's parameters
+            status (str): "ok", "failed" or "skipped"
+            start (float): Start time as a Unix timestamp
+            seconds (float): Duration
+            error: The exception or error message, if the job failed
+            attempts (int): Number of attempts (see parallel_batch_cli_call retries)
+        """
+        row = {"index": index, "name": name, "status": status,
+               "start": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start)),
+               "seconds": round(seconds, 4), "attempts": attempts,
+               "error": None if error is None else str(error),
+               "args": {str(k): v if v is None or isinstance(v, (str, int, float, bool)) else str(v)
+                        for k, v in args.items()}}
+        with self._lock:
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
+                if self._csv:
+                    csv.writer(f).writerow([json.dumps(row["args"]) if k == "args" else row[k]
+                                            for k in self.FIELDS])
+                else:
+                    f.write(json.dumps(row) + "\n")
+
+
+def _open_timings(timings):
+    """Accept a JobTimings, a timings file path or None."""
+    if timings is None or isinstance(timings, JobTimings):
+        return timings
+    return JobTimings(timings)
+
+#--------
+
+_MODEL_SUFFIXES = (".pth", ".safetensors")
+
+def _catalog_reason(catalog, model_columns, arg_dict):
+    """
+    Return why a job's models cannot be used together according to the catalog, or None.
+    
+    catalog is a model_catalog.ModelCatalog or anything with check_compatible(*paths).
+    """
+    if catalog is None:
+        return None
+    if model_columns is None:
+        paths = [
+            value for key, value in arg_dict.items()
+            if isinstance(value, str) and "output" not in str(key).lower()
+            and value.strip().lower().endswith(_MODEL_SUFFIXES)
+        ]
+    else:
+        paths = [arg_dict[column] for column in model_columns if arg_dict.get(column) not in (None, "")]
+    if not paths:
+        return None
+    return catalog.check_compatible(*paths)
+
+def build_cli_cmd(base_cmd, arg_dict):
+    """
+    Build the argument list for one CLI call.
     
     Args:
         base_cmd (list): Base command to run as a list of strings.
-                         Example: ["python", "tools/infer_cli.py"]
-        arg_dict (dict): Dictionary of parameter names and values to be passed to the command.
-                         Keys are parameter names (without '--' prefix) and values are the parameter values.
-                         Example: {"input": "file.wav", "output": "result.wav"}
-                         If a value is None, the parameter will be skipped.
+        arg_dict (dict): Parameter names and values. See cli_call.
     
     Returns:
-        None: The function runs the command but does not return any value.
-              The command output will be displayed in the console.
+        list: The full command as a list of strings.
     """
     cmd = list(base_cmd)  # copy base
     for k, v in arg_dict.items():
@@ -76,53 +515,612 @@ def cli_call(base_cmd, arg_dict):
         else:
             cmd.append(str(k))
         cmd.append(str(v))  # ensure value is string
+    return cmd
+
+def cli_call(base_cmd, arg_dict):
+    """
+    Run a command-line tool with parameters from a dictionary.
     
+    Args:
+        base_cmd (list): Base command to run as a list of strings.
+                         Example: ["python", "tools/infer_cli.py"]
+        arg_dict (dict): Dictionary of parameter names and values to be passed to the command.
+                         Keys are parameter names (without '--' prefix) and values are the parameter values.
+                         Example: {"input": "file.wav", "output": "result.wav"}
+                         If a value is None, the parameter will be skipped.
+    
+    Returns:
+        None: The function runs the command but does not return any value.
+              The command output will be displayed in the console.
+    """
+    cmd = build_cli_cmd(base_cmd, arg_dict)
     print(f"Running command: {' '.join(cmd)}")
     # Run the command
     subprocess.run(cmd, check=True)
 
-def batch_cli_call(base_cmd, arg_dicts):
+def batch_cli_call(base_cmd, arg_dicts, journal=None, timings=None, catalog=None, model_columns=None):
     """
     Run the same CLI command multiple times with different parameters.
     
     Args:
         base_cmd (list): Base command to run as a list of strings.
                          Example: ["python", "tools/infer_cli.py"]
-        arg_dicts (list): A list of dictionaries, where each dictionary contains parameter names as keys
-                          and their values to be passed to the command for each separate call.
-                          Example: [{"input": "file1.wav"}, {"input": "file2.wav"}]
+        arg_dicts (iterable): A list (or iterator, e.g. from iter_arg_dicts_from_xlsx) of dictionaries,
+                              where each dictionary contains parameter names as keys
+                              and their values to be passed to the command for each separate call.
+                              Example: [{"input": "file1.wav"}, {"input": "file2.wav"}]
+        journal (JobJournal or str): Optional journal (or journal file path). Jobs that already
+                                     succeeded with the same arguments and unchanged input files,
+                                     and whose outputs still exist, are skipped.
+        timings (JobTimings or str): Optional timing log (or .csv / .jsonl path) that gets one
+                                     row per job. See JobTimings.
+        catalog (ModelCatalog): Optional model catalog (model_catalog.py). Jobs whose models cannot
+                                be blended together or cannot be read are skipped without running.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
+                              Default: every parameter whose value ends in .pth or .safetensors,
+                              except output parameters.
     
     Returns:
         None: The function runs the commands but does not return any value.
               The command outputs will be displayed in the console.
     """
-    for params in arg_dicts:
-        cli_call(base_cmd, params)
+    journal = _open_journal(journal)
+    timings = _open_timings(timings)
+    for index, params in enumerate(arg_dicts):
+        name = " ".join(build_cli_cmd(base_cmd, params))
+        reason = _catalog_reason(catalog, model_columns, params)
+        if reason:
+            print(f"Skipping incompatible job: {name} ({reason})")
+            if timings is not None:
+                timings.record(index, name, params, "skipped", time.time(), 0.0, reason, attempts=0)
+            continue
+        job = journal.prepare(params) if journal is not None else None
+        if job is not None and journal.completed(job) is not None:
+            print(f"Skipping unchanged job: {name}")
+            if timings is not None:
+                timings.record(index, name, params, "skipped", time.time(), 0.0, attempts=0)
+            continue
+        start, clock = time.time(), time.perf_counter()
+        try:
+            cli_call(base_cmd, params)
+        except subprocess.CalledProcessError as error:
+            if job is not None:
+                journal.record(job, "failed", error.returncode)
+            if timings is not None:
+                timings.record(index, name, params, "failed", start, time.perf_counter() - clock, error)
+            raise
+        if job is not None:
+            journal.record(job, "ok", 0)
+        if timings is not None:
+            timings.record(index, name, params, "ok", start, time.perf_counter() - clock)
+
+def _run_cli_job(base_cmd, index, arg_dict, timeout, retries, backoff, log_dir):
+    """Run one job of parallel_batch_cli_call with retries and return its result record."""
+    cmd = build_cli_cmd(base_cmd, arg_dict)
+    log_path = os.path.join(log_dir, f"job_{index:04d}.log") if log_dir else None
+    record = {"index": index, "args": arg_dict, "cmd": cmd, "returncode": None, "error": None,
+              "attempts": 0, "duration": 0.0, "log_path": log_path, "skipped": False,
+              "start": time.time()}
+    start = time.monotonic()
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        record["attempts"] = attempt + 1
+        try:
+            if log_path:
+                with open(log_path, "a" if attempt else "w", encoding="utf-8") as log:
+                    log.write(f"$ {' '.join(cmd)}  (attempt {attempt + 1})\n")
+                    log.flush()
+                    completed = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, timeout=timeout)
+            else:
+                completed = subprocess.run(cmd, timeout=timeout)
+            record["returncode"] = completed.returncode
+            record["error"] = None if completed.returncode == 0 else f"exit status {completed.returncode}"
+        except subprocess.TimeoutExpired:
+            record["error"] = f"timed out after {timeout}s"
+        except OSError as error:
+            record["error"] = str(error)
+        if record["error"] is None:
+            break
+    record["duration"] = time.monotonic() - start
+
+    status = "OK" if record["error"] is None else f"FAILED ({record['error']})"
+    print(f"[job {index}] {status} in {record['duration']:.1f}s: {' '.join(cmd)}")
+    return record
+
+def _skipped_job(base_cmd, index, arg_dict, error=None):
+    """Return a finished future holding the result record of a job skipped by the journal or the catalog."""
+    future = Future()
+    future.set_result({"index": index, "args": arg_dict, "cmd": build_cli_cmd(base_cmd, arg_dict),
+                       "returncode": 0 if error is None else None, "error": error, "attempts": 0, "duration": 0.0,
+                       "log_path": None, "skipped": True, "start": time.time()})
+    return future
+
+def parallel_batch_cli_call(base_cmd, arg_dicts, max_workers=None, slot_column=None, timeout=None,
+                            retries=0, backoff=2.0, log_dir=None, continue_on_error=True, journal=None,
+                            timings=None, catalog=None, model_columns=None):
+    """
+    Run the same CLI command with different parameters, several jobs at a time.
+    
+    Args:
+        base_cmd (list): Base command to run as a list of strings.
+                         Example: ["python", "tools/infer_cli.py"]
+        arg_dicts (iterable): Dictionaries of parameters, one per job. See batch_cli_call.
+        max_workers (int): Number of slots, i.e. how many single-slot jobs run at the same time.
+                           Defaults to the CPU count (set it explicitly on pods, where the
+                           reported CPU count is often wrong).
+        slot_column (str): Optional parameter name holding each job's slot cost, e.g. "slots".
+                           A job with cost 4 uses 4 of the max_workers slots while it runs.
+                           The column is not passed to the command. Empty cells cost 1.
+        timeout (float): Seconds before a job is killed and counted as failed. None = no limit.
+        retries (int): How many times a failed job is retried.
+        backoff (float): Seconds to wait before the first retry, doubled for each further retry.
+        log_dir (str): If given, each job's stdout and stderr are written to
+                       log_dir/job_<index>.log instead of the console.
+        continue_on_error (bool): If False, no new jobs are started after the first failure.
+        journal (JobJournal or str): Optional journal (or journal file path) used to skip jobs that
+                                     are unchanged since a previous run. See JobJournal.
+        timings (JobTimings or str): Optional timing log (or .csv / .jsonl path) that gets one
+                                     row per job as it finishes. See JobTimings.
+        catalog (ModelCatalog): Optional model catalog (model_catalog.py). Jobs whose models cannot
+                                be blended together or cannot be read are not run; they are
+                                reported in "failed" as skipped, with the catalog's reason as error.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
+                              Default: every parameter whose value ends in .pth or .safetensors,
+                              except output parameters.
+    
+    Returns:
+        dict: {"results": [...], "failed": [...]} where each entry is a result record with the job
+              "index" (0-based position in arg_dicts), "args", "cmd", "returncode", "error"
+              (None on success), "attempts", "start", "duration", "log_path" and "skipped".
+              Results are in input order.
+    """
+    capacity = max(1, max_workers or os.cpu_count() or 1)
+    journal = _open_journal(journal)
+    timings = _open_timings(timings)
+
+    def log_timing(record):
+        if timings is not None:
+            status = "skipped" if record["skipped"] else "ok" if record["error"] is None else "failed"
+            timings.record(record["index"], " ".join(record["cmd"]), record["args"], status,
+                           record["start"], record["duration"], record["error"], record["attempts"])
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    condition = threading.Condition()
+    free_slots = capacity
+    stop = threading.Event()
 
-def batch_call(f, arg_dicts):
+    def run(index, params, cost, job):
+        nonlocal free_slots
+        try:
+            record = _run_cli_job(base_cmd, index, params, timeout, retries, backoff, log_dir)
+            if job is not None:
+                journal.record(job, "ok" if record["error"] is None else "failed", record["returncode"])
+            log_timing(record)
+            if record["error"] is not None and not continue_on_error:
+                stop.set()
+            return record
+        finally:
+            with condition:
+                free_slots += cost
+                condition.notify_all()
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=capacity) as pool:
+        for index, params in enumerate(arg_dicts):
+            params = dict(params)
+            cost = params.pop(slot_column, None) if slot_column else None
+            cost = 1 if cost in (None, "") else min(capacity, max(1, int(float(cost))))
+            reason = _catalog_reason(catalog, model_columns, params)
+            if reason:
+                print(f"[job {index}] skipped, incompatible models: {reason}")
+                futures.append(_skipped_job(base_cmd, index, params, reason))
+                log_timing(futures[-1].result())
+                continue
+            job = journal.prepare(params) if journal is not None else None
+            if job is not None and journal.completed(job) is not None:
+                print(f"[job {index}] skipped, unchanged since last run")
+                futures.append(_skipped_job(base_cmd, index, params))
+                log_timing(futures[-1].result())
+                continue
+            # Start jobs in order, each as soon as enough slots are free
+            with condition:
+                condition.wait_for(lambda: free_slots >= cost or stop.is_set())
+                if stop.is_set():
+                    break
+                free_slots -= cost
+            futures.append(pool.submit(run, index, params, cost, job))
+
+    results = [future.result() for future in futures]
+    failed = [record for record in results if record["error"] is not None]
+    print(f"Finished {len(results)} jobs: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+    for record in failed:
+        print(f"  - job {record['index']}: {record['error']} (args: {record['args']})")
+    return {"results": results, "failed": failed}
+
+def batch_call(f, arg_dicts, journal=None, timings=None, catalog=None, model_columns=None):
     """
     Call a function multiple times with different parameters and collect the results.
     
     Args:
         f (callable): The function to call repeatedly. 
                       This function should accept keyword arguments that match the keys in arg_dicts.
-        arg_dicts (list): A list of dictionaries, where each dictionary contains parameter names as keys
-                          and their values to be passed to the function for each separate call.
-                          Example: [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+        arg_dicts (iterable): A list (or iterator, e.g. from iter_arg_dicts_from_xlsx) of dictionaries,
+                              where each dictionary contains parameter names as keys
+                              and their values to be passed to the function for each separate call.
+                              Example: [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+        journal (JobJournal or str): Optional journal (or journal file path). Calls that already
+                                     succeeded with the same arguments and unchanged input files,
+                                     and whose outputs still exist, are skipped and return the
+                                     result recorded in the journal (see JobJournal.result).
+        timings (JobTimings or str): Optional timing log (or .csv / .jsonl path) that gets one
+                                     row per call. See JobTimings.
+        catalog (ModelCatalog): Optional model catalog (model_catalog.py). Calls whose models cannot
+                                be blended together or cannot be read are skipped; their result
+                                is the catalog's reason (a string, as the blenders return).
+        model_columns (list): Parameters holding the model paths checked against the catalog.
+                              Default: every parameter whose value ends in .pth or .safetensors,
+                              except output parameters.
     
     Returns:
         list: A list containing the return values from each function call.
               The results are in the same order as the input arg_dicts.
     """
+    journal = _open_journal(journal)
+    timings = _open_timings(timings)
     results = []
-    for kwargs in arg_dicts:
+    for index, kwargs in enumerate(arg_dicts):
+        reason = _catalog_reason(catalog, model_columns, kwargs)
+        if reason:
+            print(f"Skipping {f.__name__} with arguments: {kwargs} ({reason})")
+            if timings is not None:
+                timings.record(index, f.__name__, kwargs, "skipped", time.time(), 0.0, reason, attempts=0)
+            results.append(reason)
+            continue
+        job = journal.prepare(kwargs) if journal is not None else None
+        entry = journal.completed(job) if job is not None else None
+        if entry is not None:
+            print(f"Skipping {f.__name__} with arguments: {kwargs} (unchanged since last run)")
+            if timings is not None:
+                timings.record(index, f.__name__, kwargs, "skipped", time.time(), 0.0, attempts=0)
+            results.append(journal.result(entry))
+            continue
         print(f"Calling {f.__name__} with arguments: {kwargs}")
-        results.append(f(**kwargs))  # unpack dict into arguments
+        start, clock = time.time(), time.perf_counter()
+        try:
+            result = f(**kwargs)  # unpack dict into arguments
+        except Exception as error:
+            if job is not None:
+                journal.record(job, "failed", repr(error))
+            if timings is not None:
+                timings.record(index, f.__name__, kwargs, "failed", start, time.perf_counter() - clock, repr(error))
+            raise
+        if job is not None:
+            journal.record(job, "ok", result)
+        if timings is not None:
+            timings.record(index, f.__name__, kwargs, "ok", start, time.perf_counter() - clock)
+        results.append(result)
     return results
 
+def _portable_error(error):
+    """Return error, or a RuntimeError with its repr if it cannot be sent between processes."""
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+def _call_chunk(f, chunk):
+    """Call f for each (index, kwargs) in chunk, catching exceptions per row, and time each call."""
+    results = []
+    for index, kwargs in chunk:
+        start, clock = time.time(), time.perf_counter()
+        try:
+            result = f(**kwargs)
+        except Exception as error:
+            result = _portable_error(error)
+        results.append((index, result, start, time.perf_counter() - clock))
+    return results
+
+class _ResultWriter:
+    """Append finished rows to a .csv (flushed per row) or .xlsx (saved when closed) file."""
+
+    def __init__(self, output_path, param_names):
+        self.output_path = output_path
+        self.fieldnames = ["row"] + [name for name in param_names if name not in ("row", "result", "error")] + ["result", "error"]
+        self._xlsx = output_path.lower().endswith(".xlsx")
+        if self._xlsx:
+            self._workbook = openpyxl.Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._sheet.append(self.fieldnames)
+        else:
+            self._file = open(output_path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+            self._writer.writeheader()
+
+    def write(self, index, kwargs, result):
+        row = dict(kwargs, row=index)
+        if isinstance(result, Exception):
+            row["result"], row["error"] = None, repr(result)
+        else:
+            row["result"], row["error"] = result, None
+        if self._xlsx:
+            values = [row.get(name) for name in self.fieldnames]
+            self._sheet.append([v if v is None or isinstance(v, (str, int, float, bool)) else str(v) for v in values])
+        else:
+            self._writer.writerow(row)
+            self._file.flush()
+
+    def close(self):
+        if self._xlsx:
+            self._workbook.save(self.output_path)
+        else:
+            self._file.close()
+
+def parallel_batch_call(f, arg_dicts, executor="process", max_workers=None, chunksize=1,
+                        max_in_flight=None, on_result=None, output_path=None, timings=None, catalog=None,
+                        model_columns=None):
+    """
+    Call a function with different parameters on a process or thread pool.
+    
+    Exceptions are caught per row, so one failing row does not lose the results already
+    computed. Finished rows can be streamed to a callback and/or an output file as soon as
+    they complete; the returned list is always in input order.
+    
+    Args:
+        f (callable): The function to call. With executor="process" it must be importable
+                      (defined in a .py file, not in a notebook cell).
+        arg_dicts (iterable): Dictionaries of keyword arguments, one per call.
+        executor (str): "process" for CPU-heavy work such as blends, "thread" for work that
+                        waits on I/O or releases the GIL.
+        max_workers (int): Pool size. Defaults to the CPU count.
+        chunksize (int): Rows sent to a worker at a time. Larger chunks cut overhead for short calls.
+        max_in_flight (int): Maximum number of chunks submitted but not yet finished, which bounds
+                             memory when arg_dicts is a long iterator. Defaults to 2 * max_workers.
+        on_result (callable): Called as on_result(index, kwargs, result) in the calling process as
+                              each row finishes (in completion order). result is the exception
+                              if the call raised.
+        output_path (str): Optional .csv or .xlsx file that gets one row per finished call with its
+                           "row" index, parameters, "result" and "error". CSV rows are flushed as
+                           they finish; an .xlsx file is written when the batch ends.
+        timings (JobTimings or str): Optional timing log (or .csv / .jsonl path) that gets one
+                                     row per call, timed inside the worker. See JobTimings.
+        catalog (ModelCatalog): Optional model catalog (model_catalog.py). Rows whose models cannot
+                                be blended together or cannot be read are not sent to the pool;
+                                they hold a ValueError with the catalog's reason.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
+                              Default: every parameter whose value ends in .pth or .safetensors,
+                              except output parameters.
+    
+    Returns:
+        list: The return value of each call, in the same order as arg_dicts. Rows that raised
+              hold the exception instead. If a whole chunk is lost (a worker crashed, or f or
+              a result could not be pickled), each of its rows holds that error.
+    """
+    if executor == "process":
+        pool_class = ProcessPoolExecutor
+    elif executor == "thread":
+        pool_class = ThreadPoolExecutor
+    else:
+        raise ValueError(f"executor must be 'process' or 'thread', not {executor!r}")
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * max_workers
+    timings = _open_timings(timings)
+    name = getattr(f, "__name__", str(f))
+
+    results = {}
+    submitted = {}
+    chunk_rows = {}  # future -> indexes of its rows
+    writer = None
+
+    def finish(future):
+        indexes = chunk_rows.pop(future)
+        try:
+            rows = future.result()
+        except Exception as error:
+            # The whole chunk was lost, e.g. a worker crashed or f or a result could not be pickled
+            error = _portable_error(error)
+            rows = [(index, error, time.time(), 0.0) for index in indexes]
+        for index, result, start, seconds in rows:
+            kwargs = submitted.pop(index)
+            results[index] = result
+            failed = isinstance(result, Exception)
+            if failed:
+                print(f"Row {index} failed: {result!r}")
+            if timings is not None:
+                timings.record(index, name, kwargs, "failed" if failed else "ok", start, seconds,
+                               repr(result) if failed else None)
+            if writer is not None:
+                writer.write(index, kwargs, result)
+            if on_result is not None:
+                on_result(index, kwargs, result)
+
+    try:
+        with pool_class(max_workers=max_workers) as pool:
+            in_flight = set()
+            chunk = []
+            rows = enumerate(arg_dicts)
+            while True:
+                row = next(rows, None)
+                if row is not None:
+                    index, kwargs = row
+                    if output_path and writer is None:
+                        writer = _ResultWriter(output_path, list(kwargs))
+                    submitted[index] = kwargs
+                    reason = _catalog_reason(catalog, model_columns, kwargs)
+                    if reason:
+                        # Finish the row as failed without running it
+                        future = Future()
+                        future.set_result([(index, ValueError(reason), time.time(), 0.0)])
+                        chunk_rows[future] = [index]
+                        finish(future)
+                        continue
+                    chunk.append(row)
+                    if len(chunk) < chunksize:
+                        continue
+                if chunk:
+                    try:
+                        future = pool.submit(_call_chunk, f, chunk)
+                    except Exception as error:  # e.g. BrokenProcessPool after a worker crashed
+                        future = Future()
+                        future.set_exception(error)
+                    chunk_rows[future] = [index for index, _ in chunk]
+                    in_flight.add(future)
+                    chunk = []
+                # Wait for room (or, at the end, for everything) before submitting more
+                while in_flight and (len(in_flight) >= max_in_flight or row is None):
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
+                if row is None:
+                    break
+    finally:
+        if writer is not None:
+            writer.close()
+
+    failed = sum(isinstance(result, Exception) for result in results.values())
+    print(f"Finished {len(results)} calls of {getattr(f, '__name__', f)}: {failed} failed")
+    return [results[index] for index in sorted(results)]
+
+# State of a warm worker process (see WarmWorkerPool)
+_warm_target = None
+
+def _configure_checkpoint_cache(max_bytes):
+    """
+    Set the memory budget of the process-wide checkpoint cache (checkpoint_cache.py) in this worker.
+    
+    Targets load checkpoints through checkpoint_cache.cached_load (blender, model_blender and
+    explore_model already do), so rows of the same worker share one cache with the rest of the
+    blend tools. Prints a warning if checkpoint_cache is not importable.
+    """
+    try:
+        from checkpoint_cache import configure_checkpoint_cache
+    except ImportError:
+        print("checkpoint_cache is not importable in the worker; checkpoints will not be cached")
+        return
+    configure_checkpoint_cache(max_bytes)
+
+def _warm_worker_init(target, checkpoint_cache_bytes):
+    """
+    Import the target once when the worker process starts.
+    
+    The checkpoint cache is configured first, so it also applies to checkpoints the target's
+    module loads while it is imported.
+    """
+    global _warm_target
+    if checkpoint_cache_bytes is not None:
+        _configure_checkpoint_cache(checkpoint_cache_bytes)
+    if isinstance(target, str):
+        module_name, _, function_name = target.partition(":")
+        _warm_target = getattr(importlib.import_module(module_name), function_name)
+    else:
+        _warm_target = target
+
+def _warm_worker_call(job):
+    """Run one row in a warm worker. Returns (index, result or exception)."""
+    index, kwargs = job
+    try:
+        return index, _warm_target(**kwargs)
+    except Exception as error:
+        traceback.print_exc()
+        return index, _portable_error(error)
+
+class WarmWorkerPool:
+    """
+    Long-lived worker processes that import a function once and then run many rows with it.
+    
+    Each worker pays the interpreter start-up and the import of the target (torch, the RVC
+    model stack, ...) only once. Rows are sent to the workers over pipes. Checkpoints that the
+    target loads through checkpoint_cache.cached_load (as blender, model_blender and
+    explore_model do) stay in that process-wide cache between rows, so consecutive rows using
+    the same .pth file do not load it again. torch.load itself is not patched; see
+    CheckpointCache for the read-only rule on cached tensors.
+    
+    Args:
+        target (str or callable): "module:function" to import in the workers, e.g.
+                                  "inference:run_pipeline", or an importable function.
+                                  (Functions defined in a notebook cannot be sent to workers.)
+        workers (int): Number of worker processes.
+        checkpoint_cache_bytes (int): Memory budget of each worker's checkpoint cache
+                                      (see checkpoint_cache.configure_checkpoint_cache).
+                                      0 disables it; None keeps the default.
+        start_method (str): multiprocessing start method. "spawn" gives clean workers that
+                            are safe to use with torch.
+    
+    Example:
+        with WarmWorkerPool("inference:run_pipeline", workers=4) as pool:
+            results = pool.map(iter_arg_dicts_from_xlsx("inference_jobs.xlsx"))
+    """
+
+    def __init__(self, target, workers=1, checkpoint_cache_bytes=None, start_method="spawn"):
+        self.target = target
+        module_name = getattr(target, "__module__", None)
+        qualname = getattr(target, "__qualname__", "")
+        if callable(target) and module_name not in (None, "__main__") and "." not in qualname:
+            # Send a reference instead of the function itself: unpickling the function would
+            # import its module before _warm_worker_init has configured the checkpoint cache
+            target = f"{module_name}:{qualname}"
+        context = multiprocessing.get_context(start_method)
+        self._pool = context.Pool(
+            processes=workers,
+            initializer=_warm_worker_init,
+            initargs=(target, checkpoint_cache_bytes),
+        )
+
+    def map(self, arg_dicts):
+        """
+        Run the target once per argument dictionary.
+        
+        Args:
+            arg_dicts (iterable): Dictionaries of keyword arguments, one per row.
+        
+        Returns:
+            list: The return value of each call, in the same order as arg_dicts. Rows that raised
+                  hold the exception instead, so one failing row does not lose the others.
+        """
+        results = []
+        for index, result in self._pool.imap(_warm_worker_call, enumerate(arg_dicts)):
+            if isinstance(result, Exception):
+                print(f"Row {index} failed: {result!r}")
+            results.append(result)
+        return results
+
+    def close(self):
+        """Stop the worker processes."""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def warm_batch_call(target, arg_dicts, workers=1, checkpoint_cache_bytes=None):
+    """
+    Call a function once per argument dictionary in warm worker processes.
+    
+    Like batch_call, but the target is imported once per worker instead of paying interpreter
+    start-up and imports on every row. See WarmWorkerPool.
+    
+    Args:
+        target (str or callable): "module:function", e.g. "inference:run_pipeline", or an importable function.
+        arg_dicts (iterable): Dictionaries of keyword arguments, one per call.
+        workers (int): Number of worker processes.
+        checkpoint_cache_bytes (int): Memory budget of each worker's checkpoint cache (None: default).
+    
+    Returns:
+        list: The return values (or raised exceptions) in the same order as arg_dicts.
+    """
+    with WarmWorkerPool(target, workers=workers, checkpoint_cache_bytes=checkpoint_cache_bytes) as pool:
+        return pool.map(arg_dicts)
+
 # -------
 
-def batch_cli_call_from_xlsx(base_cmd, xlsx_path):
+def batch_cli_call_from_xlsx(base_cmd, xlsx_path, parallel=False, journal=None, types=None, timings=None,
+                             required=None, prevalidate=False, catalog=None, model_columns=None,
+                             **parallel_options):
     """
     Run a CLI command multiple times with parameters from an Excel file.
     
@@ -132,15 +1130,34 @@ def batch_cli_call_from_xlsx(base_cmd, xlsx_path):
         xlsx_path (str): The file path to the Excel (.xlsx) file containing parameter data.
                          The file should have parameter names in the first row as headers,
                          with each subsequent row representing a set of parameters.
+        parallel (bool): If True, run the jobs with parallel_batch_cli_call.
+        journal (JobJournal or str): Optional journal (or journal file path) for resuming an
+                                     interrupted run. See JobJournal.
+        types (dict): Optional column types, e.g. {"ratio": float}. See iter_arg_dicts_from_xlsx.
+        timings (JobTimings or str): Optional per-job timing log (or .csv / .jsonl path). See JobTimings.
+        required (list): Optional columns that must exist and must not be empty in any row.
+        prevalidate (bool): If True, check every row before the first job runs, so a bad value
+                            anywhere in the file fails before any work is done.
+        catalog (ModelCatalog): Optional model catalog; rows with incompatible models are skipped.
+                                See batch_call.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
+        **parallel_options: Options for parallel_batch_cli_call, e.g. max_workers, slot_column,
+                            timeout, retries, log_dir, continue_on_error.
     
     Returns:
         None: The function runs the commands but does not return any value.
               The command outputs will be displayed in the console.
+        dict: With parallel=True, the summary returned by parallel_batch_cli_call.
     """
-    arg_dicts = extract_arg_dicts_from_xlsx(xlsx_path)
-    return batch_cli_call(base_cmd, arg_dicts)
+    arg_dicts = iter_arg_dicts_from_xlsx(xlsx_path, types=types, required=required, prevalidate=prevalidate)
+    if parallel:
+        return parallel_batch_cli_call(base_cmd, arg_dicts, journal=journal, timings=timings, catalog=catalog,
+                                       model_columns=model_columns, **parallel_options)
+    return batch_cli_call(base_cmd, arg_dicts, journal=journal, timings=timings, catalog=catalog,
+                          model_columns=model_columns)
 
-def batch_call_from_xlsx(f, xlsx_path):
+def batch_call_from_xlsx(f, xlsx_path, journal=None, types=None, timings=None, required=None,
+                         prevalidate=False, catalog=None, model_columns=None):
     """
     Call a function multiple times with parameters from an Excel file and collect the results.
     
@@ -150,15 +1167,27 @@ def batch_call_from_xlsx(f, xlsx_path):
         xlsx_path (str): The file path to the Excel (.xlsx) file containing parameter data.
                          The file should have parameter names in the first row as headers,
                          with each subsequent row representing a set of parameters.
+        journal (JobJournal or str): Optional journal (or journal file path) for resuming an
+                                     interrupted run. See JobJournal.
+        types (dict): Optional column types, e.g. {"ratio": float}. See iter_arg_dicts_from_xlsx.
+        timings (JobTimings or str): Optional per-job timing log (or .csv / .jsonl path). See JobTimings.
+        required (list): Optional columns that must exist and must not be empty in any row.
+        prevalidate (bool): If True, check every row before the first job runs, so a bad value
+                            anywhere in the file fails before any work is done.
+        catalog (ModelCatalog): Optional model catalog; rows with incompatible models are skipped.
+                                See batch_call.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
     
     Returns:
         list: A list containing the return values from each function call.
               The results are in the same order as the rows in the Excel file.
     """
-    arg_dicts = extract_arg_dicts_from_xlsx(xlsx_path)
-    return batch_call(f, arg_dicts)
+    arg_dicts = iter_arg_dicts_from_xlsx(xlsx_path, types=types, required=required, prevalidate=prevalidate)
+    return batch_call(f, arg_dicts, journal=journal, timings=timings, catalog=catalog, model_columns=model_columns)
 
-def batch_cli_call_from_csv(base_cmd, csv_path):
+def batch_cli_call_from_csv(base_cmd, csv_path, parallel=False, journal=None, types=None, timings=None,
+                            required=None, prevalidate=False, catalog=None, model_columns=None,
+                            **parallel_options):
     """
     Run a CLI command multiple times with parameters from a CSV file.
     
@@ -168,15 +1197,34 @@ def batch_cli_call_from_csv(base_cmd, csv_path):
         csv_path (str): The file path to the CSV file containing parameter data.
                         The file should have parameter names in the first row as headers,
                         with each subsequent row representing a set of parameters.
+        parallel (bool): If True, run the jobs with parallel_batch_cli_call.
+        journal (JobJournal or str): Optional journal (or journal file path) for resuming an
+                                     interrupted run. See JobJournal.
+        types (dict): Optional column types, e.g. {"ratio": float}. See iter_arg_dicts_from_xlsx.
+        timings (JobTimings or str): Optional per-job timing log (or .csv / .jsonl path). See JobTimings.
+        required (list): Optional columns that must exist and must not be empty in any row.
+        prevalidate (bool): If True, check every row before the first job runs, so a bad value
+                            anywhere in the file fails before any work is done.
+        catalog (ModelCatalog): Optional model catalog; rows with incompatible models are skipped.
+                                See batch_call.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
+        **parallel_options: Options for parallel_batch_cli_call, e.g. max_workers, slot_column,
+                            timeout, retries, log_dir, continue_on_error.
     
     Returns:
         None: The function runs the commands but does not return any value.
               The command outputs will be displayed in the console.
+        dict: With parallel=True, the summary returned by parallel_batch_cli_call.
     """
-    arg_dicts = extract_arg_dicts_from_csv(csv_path)
-    return batch_cli_call(base_cmd, arg_dicts)
+    arg_dicts = iter_arg_dicts_from_csv(csv_path, types=types, required=required, prevalidate=prevalidate)
+    if parallel:
+        return parallel_batch_cli_call(base_cmd, arg_dicts, journal=journal, timings=timings, catalog=catalog,
+                                       model_columns=model_columns, **parallel_options)
+    return batch_cli_call(base_cmd, arg_dicts, journal=journal, timings=timings, catalog=catalog,
+                          model_columns=model_columns)
 
-def batch_call_from_csv(f, csv_path):
+def batch_call_from_csv(f, csv_path, journal=None, types=None, timings=None, required=None,
+                        prevalidate=False, catalog=None, model_columns=None):
     """
     Call a function multiple times with parameters from a CSV file and collect the results.
     
@@ -186,13 +1234,23 @@ def batch_call_from_csv(f, csv_path):
         csv_path (str): The file path to the CSV file containing parameter data.
                         The file should have parameter names in the first row as headers,
                         with each subsequent row representing a set of parameters.
+        journal (JobJournal or str): Optional journal (or journal file path) for resuming an
+                                     interrupted run. See JobJournal.
+        types (dict): Optional column types, e.g. {"ratio": float}. See iter_arg_dicts_from_xlsx.
+        timings (JobTimings or str): Optional per-job timing log (or .csv / .jsonl path). See JobTimings.
+        required (list): Optional columns that must exist and must not be empty in any row.
+        prevalidate (bool): If True, check every row before the first job runs, so a bad value
+                            anywhere in the file fails before any work is done.
+        catalog (ModelCatalog): Optional model catalog; rows with incompatible models are skipped.
+                                See batch_call.
+        model_columns (list): Parameters holding the model paths checked against the catalog.
     
     Returns:
         list: A list containing the return values from each function call.
               The results are in the same order as the rows in the CSV file.
     """
-    arg_dicts = extract_arg_dicts_from_csv(csv_path)
-    return batch_call(f, arg_dicts)
+    arg_dicts = iter_arg_dicts_from_csv(csv_path, types=types, required=required, prevalidate=prevalidate)
+    return batch_call(f, arg_dicts, journal=journal, timings=timings, catalog=catalog, model_columns=model_columns)
 
 if __name__ == "__main__":
     # Example usage
@@ -224,3 +1282,4 @@ if __name__ == "__main__":
     # cli_xlsx_path = "tests/batch_call/cli_test.xlsx"
     # batch_cli_call_from_xlsx(base_cmd, cli_xlsx_path)
 
+    pass
@@ -0,0 +1,195 @@
+import os
+import time
+import pytest
+import openpyxl
+
+from batch_call import (JobJournal, batch_call, extract_arg_dicts_from_csv, extract_arg_dicts_from_xlsx,
+                        iter_arg_dicts_from_csv, iter_arg_dicts_from_xlsx, parallel_batch_call)
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+
+
+def write_file(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return str(path)
+
+
+def convert(model, output, calls=None):
+    """Stand-in for a blend: reads model, writes output."""
+    if calls is not None:
+        calls.append(model)
+    with open(model, encoding="utf-8") as source:
+        write_file(output, source.read().upper())
+    return ("done", output)
+
+
+def slow_square(x, delay=0.0):
+    time.sleep(delay)
+    return x * x
+
+
+def fail_on_odd(x):
+    if x % 2:
+        raise ValueError(f"odd: {x}")
+    return x
+
+
+def crash(x):
+    os._exit(1)
+
+
+# --- JobJournal ---
+
+@pytest.fixture
+def job(tmp_path):
+    return {"model": write_file(tmp_path / "a.pth", "weights"), "output": str(tmp_path / "out.pth")}
+
+
+def run(journal, arg_dicts, calls):
+    return batch_call(lambda **kwargs: convert(calls=calls, **kwargs), arg_dicts, journal=journal)
+
+
+def test_journal_skips_unchanged_jobs(tmp_path, job):
+    journal, calls = str(tmp_path / "journal.jsonl"), []
+    assert run(journal, [job], calls) == [("done", job["output"])]
+    assert run(journal, [job], calls) == [["done", job["output"]]]  # JSON form by default
+    assert calls == [job["model"]]
+
+
+def test_journal_resumes_after_an_interrupted_batch(tmp_path, job):
+    journal, calls = str(tmp_path / "journal.jsonl"), []
+    second = {"model": write_file(tmp_path / "b.pth", "other"), "output": str(tmp_path / "out_b.pth")}
+    run(journal, [job], calls)
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"key": "cut sho')  # the line a killed run leaves behind
+    run(journal, [job, second], calls)
+    assert calls == [job["model"], second["model"]]
+
+
+def test_journal_reruns_changed_inputs_and_missing_outputs(tmp_path, job):
+    journal, calls = str(tmp_path / "journal.jsonl"), []
+    run(journal, [job], calls)
+    write_file(job["model"], "new weights")
+    run(journal, [job], calls)
+    os.remove(job["output"])
+    run(journal, [job], calls)
+    assert calls == [job["model"]] * 3
+
+
+def test_journal_reruns_failed_jobs(tmp_path, job):
+    journal = str(tmp_path / "journal.jsonl")
+    os.remove(job["model"])
+    with pytest.raises(FileNotFoundError):
+        run(journal, [job], [])
+    write_file(job["model"], "weights")
+    calls = []
+    run(journal, [job], calls)
+    assert calls == [job["model"]]
+
+
+def test_journal_finds_input_files_in_nested_arguments(tmp_path, job):
+    journal = JobJournal(str(tmp_path / "journal.jsonl"))
+    prepared = journal.prepare({"models": [{"path": job["model"], "sid": 0}], "output": job["output"]})
+    assert list(prepared["inputs"]) == [job["model"]]
+    assert prepared["outputs"] == [job["output"]]
+
+
+def test_pickled_results_are_opt_in(tmp_path, job):
+    path = str(tmp_path / "journal.jsonl")
+    journal = JobJournal(path, pickle_results=True)
+    prepared = journal.prepare(job)
+    write_file(job["output"], "WEIGHTS")
+    journal.record(prepared, "ok", ("done", 1))
+    trusted, untrusted = JobJournal(path, pickle_results=True), JobJournal(path)
+    assert trusted.result(trusted.completed(prepared)) == ("done", 1)
+    assert untrusted.result(untrusted.completed(prepared)) == ["done", 1]
+
+
+# --- parallel_batch_call ---
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_results_are_in_input_order(executor):
+    # Earlier rows take longer, so they finish last
+    arg_dicts = [{"x": x, "delay": 0.05 * (4 - x)} for x in range(5)]
+    finished = []
+    results = parallel_batch_call(slow_square, arg_dicts, executor=executor, max_workers=5,
+                                  on_result=lambda index, kwargs, result: finished.append(index))
+    assert results == [0, 1, 4, 9, 16]
+    assert sorted(finished) == [0, 1, 2, 3, 4]
+
+
+def test_parallel_failures_are_kept_per_row(tmp_path):
+    output_path = str(tmp_path / "results.csv")
+    results = parallel_batch_call(fail_on_odd, ({"x": x} for x in range(6)), executor="process", max_workers=2,
+                                  chunksize=2, max_in_flight=1, output_path=output_path)
+    assert [r for r in results if not isinstance(r, Exception)] == [0, 2, 4]
+    assert [str(r) for r in results if isinstance(r, Exception)] == ["odd: 1", "odd: 3", "odd: 5"]
+    rows = extract_arg_dicts_from_csv(output_path)
+    assert sorted(int(row["row"]) for row in rows) == list(range(6))
+    assert {row["x"]: row["error"] for row in rows}["3"] == "ValueError('odd: 3')"
+
+
+def test_parallel_crashed_worker_fails_its_rows():
+    results = parallel_batch_call(crash, [{"x": 1}, {"x": 2}], executor="process", max_workers=1, chunksize=2)
+    assert len(results) == 2
+    assert all(isinstance(result, Exception) for result in results)
+
+
+def test_parallel_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        parallel_batch_call(slow_square, [{"x": 1}], executor="cluster")
+
+
+# --- Row readers ---
+
+@pytest.mark.parametrize("name", ["test.xlsx", "cli_test.xlsx", "rvc_blending_jobs.xlsx", "rvc_inference_jobs.xlsx"])
+def test_xlsx_reader_matches_extract(name):
+    path = os.path.join(TESTS, name)
+    assert list(iter_arg_dicts_from_xlsx(path)) == extract_arg_dicts_from_xlsx(path)
+
+
+@pytest.mark.parametrize("name", ["test.csv", "cli_test.csv"])
+def test_csv_reader_matches_extract(name):
+    path = os.path.join(TESTS, name)
+    assert list(iter_arg_dicts_from_csv(path)) == extract_arg_dicts_from_csv(path)
+
+
+def test_csv_reader_keeps_dictreader_rows(tmp_path):
+    path = write_file(tmp_path / "jobs.csv", "a,b\n1,2\n\n3\n4,5,6\n,\n")
+    expected = extract_arg_dicts_from_csv(path)
+    assert list(iter_arg_dicts_from_csv(path)) == expected
+    assert expected == [{"a": "1", "b": "2"}, {"a": "3", "b": None}, {"a": "4", "b": "5", None: ["6"]},
+                        {"a": "", "b": ""}]
+    assert list(iter_arg_dicts_from_csv(path, skip_empty_rows=True)) == expected[:3]
+
+
+def test_xlsx_reader_keeps_formulas_and_empty_rows(tmp_path):
+    path = str(tmp_path / "jobs.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in [["a", "b"], [1, "=A2*2"], [None, None], [3, 4]]:
+        sheet.append(row)
+    workbook.save(path)
+    rows = list(iter_arg_dicts_from_xlsx(path))
+    assert rows == extract_arg_dicts_from_xlsx(path)
+    assert rows[0] == {"a": 1, "b": "=A2*2"}
+    assert list(iter_arg_dicts_from_xlsx(path, skip_empty_rows=True)) == [rows[0], rows[2]]
+
+
+def test_reader_types_and_required_columns(tmp_path):
+    path = write_file(tmp_path / "jobs.csv", "model,ratio,f0\na.pth,0.5,yes\nb.pth,,no\n")
+    rows = list(iter_arg_dicts_from_csv(path, types={"ratio": float, "f0": bool}, required=["model"]))
+    assert rows == [{"model": "a.pth", "ratio": 0.5, "f0": True}, {"model": "b.pth", "ratio": None, "f0": False}]
+    with pytest.raises(ValueError, match="missing columns"):
+        iter_arg_dicts_from_csv(path, required=["output"])
+    with pytest.raises(ValueError, match="row 3: 'ratio' is empty"):
+        list(iter_arg_dicts_from_csv(path, required=["ratio"]))
+
+
+def test_prevalidate_fails_before_the_first_row(tmp_path):
+    path = write_file(tmp_path / "jobs.csv", "x\n1\n2\nthree\n")
+    rows = iter_arg_dicts_from_csv(path, types={"x": int})
+    assert next(rows) == {"x": 1}
+    with pytest.raises(ValueError, match="row 4: bad value for 'x'"):
+        iter_arg_dicts_from_csv(path, types={"x": int}, prevalidate=True)
@@ -0,0 +1,310 @@
+"""
+Benchmark the blend pipeline on synthetic RVC-shaped checkpoints, entirely on CPU.
+
+Generates checkpoints in the training ("model", including enc_q) and inference ("weight")
+layouts, times each stage (load, extract, rule matching, blending, save) and runs
+blender.blend_models, its streaming mode, flat_blend.flat_blend_models and
+model_blender.model_blender end to end in fresh processes to measure peak RSS.
+Results are written as JSON so runs can be compared across changes.
+
+Usage:
+    python bench_blend.py --sizes tiny,small --layouts weight,model --repeat 3 --output bench_results.json
+"""
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import torch
+import blender
+
+
+# hidden channels, decoder channels, encoder layers
+SIZES = {
+    "tiny": (48, 128, 2),
+    "small": (96, 256, 4),
+    "full": (192, 512, 6),
+}
+
+BLEND_RULES = [
+    {"layers": "emb_g.weight", "weight": 0.7},
+    {"layers": "dec.cond.*", "weight": 0.2},
+    {"layers": "flow.*", "weight": 0.4},
+    {"layers": "enc_p.encoder.attn_layers.*", "weight": 0.6},
+]
+
+
+def synthetic_state_dict(size, n_speakers=1, seed=0):
+    """Build a state dict with RVC v2 layer names and (scaled) shapes."""
+    hidden, channels, n_layers = SIZES[size]
+    generator = torch.Generator().manual_seed(seed)
+    shapes = OrderedDict()
+
+    shapes["enc_p.emb_phone.weight"] = (hidden, 768)
+    shapes["enc_p.emb_phone.bias"] = (hidden,)
+    shapes["enc_p.emb_pitch.weight"] = (256, hidden)
+    for i in range(n_layers):
+        for name in ("conv_q", "conv_k", "conv_v", "conv_o"):
+            shapes[f"enc_p.encoder.attn_layers.{i}.{name}.weight"] = (hidden, hidden, 1)
+            shapes[f"enc_p.encoder.attn_layers.{i}.{name}.bias"] = (hidden,)
+        shapes[f"enc_p.encoder.ffn_layers.{i}.conv_1.weight"] = (hidden * 4, hidden, 3)
+        shapes[f"enc_p.encoder.ffn_layers.{i}.conv_2.weight"] = (hidden, hidden * 4, 3)
+        for norm in ("norm_layers_1", "norm_layers_2"):
+            shapes[f"enc_p.encoder.{norm}.{i}.gamma"] = (hidden,)
+            shapes[f"enc_p.encoder.{norm}.{i}.beta"] = (hidden,)
+    shapes["enc_p.proj.weight"] = (hidden * 2, hidden, 1)
+
+    shapes["dec.conv_pre.weight"] = (channels, hidden, 7)
+    shapes["dec.cond.weight"] = (channels, 256, 1)
+    shapes["dec.cond.bias"] = (channels,)
+    c = channels
+    for i in range(4):
+        shapes[f"dec.ups.{i}.weight_v"] = (c, c // 2, 16)
+        for j in range(3):
+            shapes[f"dec.resblocks.{i * 3 + j}.convs1.0.weight_v"] = (c // 2, c // 2, 3 + 2 * j)
+            shapes[f"dec.resblocks.{i * 3 + j}.convs2.0.weight_v"] = (c // 2, c // 2, 3 + 2 * j)
+        c //= 2
+    shapes["dec.conv_post.weight"] = (1, c, 7)
+
+    for i in (0, 2, 4, 6):
+        shapes[f"flow.flows.{i}.pre.weight"] = (hidden, hidden // 2, 1)
+        for j in range(3):
+            shapes[f"flow.flows.{i}.enc.in_layers.{j}.weight_v"] = (hidden * 2, hidden, 5)
+            shapes[f"flow.flows.{i}.enc.res_skip_layers.{j}.weight_v"] = (hidden * 2, hidden, 1)
+        shapes[f"flow.flows.{i}.enc.cond_layer.weight_v"] = (hidden * 6, 256, 1)
+        shapes[f"flow.flows.{i}.post.weight"] = (hidden // 2, hidden, 1)
+
+    shapes["emb_g.weight"] = (n_speakers, 256)
+    return OrderedDict(
+        (key, (torch.randn(shape, generator=generator) * 0.1).half()) for key, shape in shapes.items()
+    )
+
+
+def make_synthetic_checkpoint(path, size="small", layout="weight", n_speakers=1, seed=0):
+    """
+    Write a synthetic RVC checkpoint.
+
+    Args:
+        path (str): Output .pth path
+        size (str): "tiny", "small" or "full" (full is close to a real 40k v2 model)
+        layout (str): "weight" for inference weights, "model" for a training checkpoint with enc_q layers
+        n_speakers (int): Rows of emb_g.weight
+        seed (int): Random seed, so different seeds give different "voices"
+    """
+    hidden = SIZES[size][0]
+    state = synthetic_state_dict(size, n_speakers=n_speakers, seed=seed)
+    ckpt = OrderedDict()
+    if layout == "model":
+        generator = torch.Generator().manual_seed(seed + 1000)
+        state["enc_q.pre.weight"] = torch.randn((hidden, 1025, 1), generator=generator).half()
+        for j in range(16):
+            state[f"enc_q.enc.in_layers.{j}.weight_v"] = torch.randn((hidden * 2, hidden, 5), generator=generator).half()
+        state["enc_q.proj.weight"] = torch.randn((hidden * 2, hidden, 1), generator=generator).half()
+        ckpt["model"] = state
+        ckpt["iteration"] = 1
+    else:
+        ckpt["weight"] = state
+    ckpt["config"] = [1025, 32, hidden, hidden, 2, 2, 6, 3, 0, "1", [3, 7, 11], [[1, 3, 5]] * 3, [10, 10, 2, 2], 512, [16, 16, 4, 4], 109, 256, 40000]
+    ckpt["sr"] = "40k"
+    ckpt["f0"] = 1
+    ckpt["version"] = "v2"
+    ckpt["vocoder"] = "HiFi-GAN"
+    ckpt["info"] = f"synthetic {size} {layout} seed {seed}"
+    torch.save(ckpt, path)
+
+
+def _timed(function, repeat):
+    """Run function repeat times; return (timings, last result)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def _summary(timings):
+    return {"min_s": min(timings), "median_s": statistics.median(timings), "runs": len(timings)}
+
+
+def bench_stages(path1, path2, repeat):
+    """Time the individual stages of a two-model blend in this process."""
+    results = {}
+    # Bypass the checkpoint cache, or every run after the first would time a cache hit
+    timings, (ckpt1, ckpt2) = _timed(
+        lambda: (blender.load_checkpoint(path1, cache=False), blender.load_checkpoint(path2, cache=False)), repeat
+    )
+    results["load"] = _summary(timings)
+
+    def extract():
+        return [blender.extract(c)["weight"] if "model" in c else c["weight"] for c in (ckpt1, ckpt2)]
+
+    timings, (weights1, weights2) = _timed(extract, repeat)
+    results["extract"] = _summary(timings)
+    keys = list(weights1.keys())
+
+    def rules_fnmatch():
+        layer_weights = {}
+        for rule in BLEND_RULES:
+            for layer in blender.find_matching_layers(keys, rule["layers"]):
+                layer_weights[layer] = rule["weight"]
+        return layer_weights
+
+    def rules_compiled():
+        blender._RULE_TABLE_CACHE.clear()
+        return blender.resolve_layer_rules(keys, BLEND_RULES)
+
+    results["rules_fnmatch"] = _summary(_timed(rules_fnmatch, repeat)[0])
+    results["rules_compiled"] = _summary(_timed(rules_compiled, repeat)[0])
+    results["rules_cached"] = _summary(_timed(lambda: blender.resolve_layer_rules(keys, BLEND_RULES), repeat)[0])
+
+    table = blender.resolve_layer_rules(keys, BLEND_RULES)
+    alphas = table.layer_weights([[r["weight"], 1 - r["weight"]] for r in BLEND_RULES], [0.5, 0.5])
+
+    def blend():
+        return {key: blender.blend_layer(key, [weights1[key], weights2[key]], alphas[key]) for key in keys}
+
+    timings, blended = _timed(blend, repeat)
+    results["blend"] = _summary(timings)
+
+    with tempfile.TemporaryDirectory() as folder:
+        output_path = os.path.join(folder, "out.pth")
+        results["save"] = _summary(_timed(lambda: torch.save({"weight": blended}, output_path), repeat)[0])
+    results["tensor_bytes"] = sum(t.numel() * t.element_size() for t in blended.values())
+    results["num_layers"] = len(keys)
+    return results
+
+
+def _run_end_to_end(case, path1, path2, folder):
+    """Run one end-to-end blend (in a fresh worker process) and report its time and peak RSS."""
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    model1 = {"path": path1, "sid": 0}
+    model2 = {"path": path2, "sid": 0}
+    output_path = os.path.join(folder, f"{case}.pth")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if case == "blend_models":
+            result = blender.blend_models(output_path, model1, model2, BLEND_RULES, 0.5)
+        elif case == "blend_models_stream":
+            result = blender.blend_models(output_path, model1, model2, BLEND_RULES, 0.5, stream=True)
+        elif case == "flat_blend_models":
+            import flat_blend
+            result = flat_blend.flat_blend_models(output_path, model1, model2, BLEND_RULES, 0.5)
+        elif case == "model_blender":
+            import model_blender
+            os.chdir(folder)
+            os.makedirs("logs", exist_ok=True)
+            result = model_blender.model_blender(case, path1, path2, 0.5)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "seconds": elapsed,
+        "peak_rss_mb": peak_kb / 1024,
+        "peak_rss_over_baseline_mb": (peak_kb - baseline_kb) / 1024,
+        "error": None if isinstance(result, (str, tuple)) else repr(result),
+    }
+
+
+def _warm_imports():
+    """Import torch and the blend modules so the RSS baseline includes them."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import blender, flat_blend, model_blender  # noqa: F401
+
+
+def bench_end_to_end(case, path1, path2, folder, repeat):
+    timings, runs = [], []
+    context = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_warm_imports) as pool:
+            run = pool.submit(_run_end_to_end, case, path1, path2, folder).result()
+        runs.append(run)
+        timings.append(run["seconds"])
+    result = _summary(timings)
+    result["peak_rss_mb"] = max(run["peak_rss_mb"] for run in runs)
+    result["peak_rss_over_baseline_mb"] = max(run["peak_rss_over_baseline_mb"] for run in runs)
+    result["error"] = next((run["error"] for run in runs if run["error"]), None)
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmarks(sizes=("tiny", "small"), layouts=("weight", "model"), repeat=3,
+                   cases=("blend_models", "blend_models_stream", "flat_blend_models", "model_blender"),
+                   output_path="bench_results.json"):
+    """
+    Run the benchmark suite and write the results as JSON.
+
+    Args:
+        sizes (tuple): Synthetic model sizes (see SIZES)
+        layouts (tuple): "weight" and/or "model"
+        repeat (int): Runs per measurement; min and median are reported
+        cases (tuple): End-to-end blend functions to run
+        output_path (str): JSON results file
+    Returns:
+        dict: The results
+    """
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "repeat": repeat,
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        for size in sizes:
+            for layout in layouts:
+                path1 = os.path.join(folder, f"{size}_{layout}_1.pth")
+                path2 = os.path.join(folder, f"{size}_{layout}_2.pth")
+                make_synthetic_checkpoint(path1, size, layout, seed=1)
+                make_synthetic_checkpoint(path2, size, layout, n_speakers=2, seed=2)
+                run = {
+                    "size": size,
+                    "layout": layout,
+                    "file_bytes": os.path.getsize(path1),
+                    "stages": bench_stages(path1, path2, repeat),
+                    "end_to_end": {},
+                }
+                for case in cases:
+                    run["end_to_end"][case] = bench_end_to_end(case, path1, path2, folder, repeat)
+                results["runs"].append(run)
+                print(f"{size}/{layout}: " + ", ".join(
+                    f"{case} {r['median_s']:.3f}s {r['peak_rss_over_baseline_mb']:.0f}MB"
+                    for case, r in run["end_to_end"].items()
+                ))
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote benchmark results to {output_path}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="tiny,small", help=f"comma-separated, from {list(SIZES)}")
+    parser.add_argument("--layouts", default="weight,model", help="comma-separated: weight, model")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", default="blend_models,blend_models_stream,flat_blend_models,model_blender")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+    run_benchmarks(args.sizes.split(","), args.layouts.split(","), args.repeat, args.cases.split(","), args.output)
@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import contextlib
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+LEVELS = {"quiet": 0, "info": 1, "debug": 2}
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB (Linux only, else None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def process_peak_rss_mb():
+    """
+    Peak resident memory of this process since it started in MB, or None if unavailable.
+
+    This is ru_maxrss, a high-water mark for the whole process: it never goes down, so it is not
+    the peak of any one span.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+class BlendMetrics:
+    """
+    Timed spans and log messages for blend operations, with an optional JSON-lines sink.
+
+    Every finished span becomes one record with its name, start time, duration, bytes processed,
+    current RSS, the process-wide peak RSS so far (process_peak_rss_mb, not a per-span peak) and
+    the context fields (e.g. the output path) it was created with. Records are kept in .records
+    (if keep_records) and, if a sink is set, appended to it as one JSON object per line.
+
+    Args:
+        verbosity (str): "quiet" (errors only), "info" (one line per step) or "debug" (also span timings)
+        sink (str): Optional JSON-lines file to append records to
+        keep_records (bool): Keep records in memory in .records. The process-wide default
+                             metrics do not, so long sessions don't accumulate them.
+        **context: Fields added to every record, e.g. operation="blend_models"
+    """
+
+    def __init__(self, verbosity="info", sink=None, keep_records=True, **context):
+        if verbosity not in LEVELS:
+            raise ValueError(f"verbosity must be one of {list(LEVELS)}, not {verbosity!r}")
+        self.verbosity = verbosity
+        self.sink = sink
+        self.context = context
+        self.records = [] if keep_records else None
+        self._lock = threading.Lock()
+
+    def child(self, **context):
+        """Return metrics that share this sink, verbosity and record list, with extra context fields."""
+        child = BlendMetrics(self.verbosity, self.sink, False, **{**self.context, **context})
+        child.records = self.records
+        child._lock = self._lock
+        return child
+
+    def log(self, message, level="info"):
+        """Print a message if the verbosity allows it."""
+        if LEVELS[level] <= LEVELS[self.verbosity]:
+            print(message)
+
+    def error(self, message):
+        """Print an error message, whatever the verbosity."""
+        print(message)
+
+    def emit(self, record):
+        """Store a record (if records are kept) and append it to the sink."""
+        with self._lock:
+            if self.records is not None:
+                self.records.append(record)
+            if self.sink:
+                with open(self.sink, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    @contextlib.contextmanager
+    def span(self, name, **fields):
+        """
+        Time a block of work.
+
+        Yields the record, so the block can add fields such as record["bytes"] = ...
+
+        Example:
+            with metrics.span("save") as record:
+                torch.save(opt, output_path)
+                record["bytes"] = os.path.getsize(output_path)
+        """
+        record = {"span": name, **self.context, **fields, "start": time.time()}
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as error:
+            record["error"] = repr(error)
+            raise
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            record["rss_mb"] = current_rss_mb()
+            record["process_peak_rss_mb"] = process_peak_rss_mb()
+            self.emit(record)
+            size = f", {record['bytes'] / 1e6:.1f} MB" if record.get("bytes") else ""
+            self.log(f"  [{name}] {record['seconds']:.3f}s{size}", "debug")
+
+
+_default_metrics = BlendMetrics(keep_records=False)
+
+
+def configure_metrics(verbosity="info", sink=None):
+    """
+    Set the verbosity and JSON-lines sink used by blend functions that are not given metrics.
+
+    The default metrics keep no records in memory; use the sink to collect them.
+
+    Args:
+        verbosity (str): "quiet", "info" or "debug"
+        sink (str): JSON-lines file for the records, or None
+    Returns:
+        BlendMetrics: The new default
+    """
+    global _default_metrics
+    _default_metrics = BlendMetrics(verbosity, sink, keep_records=False)
+    return _default_metrics
+
+
+def get_metrics(metrics=None, **context):
+    """Return metrics (or the default) tagged with a new run id and the given context fields."""
+    return (metrics or _default_metrics).child(run=uuid.uuid4().hex[:12], **context)
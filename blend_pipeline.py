@@ -0,0 +1,305 @@
+import os
+import csv
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from blend_metrics import get_metrics
+from blender import (blend_layer, checkpoint_metadata, extract, load_checkpoint, resolve_blend_weights,
+                     resolve_layer_rules, save_blend, weights_nbytes)
+
+
+def load_job_sheet(path):
+    """
+    Read a blend pipeline job sheet (.xlsx or .csv) into a list of row dicts.
+
+    Empty cells become None and values are kept as text; see parse_pipeline_jobs for the columns.
+    """
+    if path.lower().endswith(".xlsx"):
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [str(h).strip() if h is not None else None for h in next(rows, [])]
+            jobs = [
+                {h: (None if v in (None, "") else str(v).strip()) for h, v in zip(headers, row) if h}
+                for row in rows if any(v not in (None, "") for v in row)
+            ]
+        finally:
+            workbook.close()
+        return jobs
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [
+            {k.strip(): (v.strip() or None) if v is not None else None for k, v in row.items() if k}
+            for row in csv.DictReader(f) if any((v or "").strip() for v in row.values())
+        ]
+
+
+def _output_format(path):
+    """save_blend format for an output path: .safetensors, .int8.pth or plain .pth."""
+    path = path.lower()
+    if path.endswith(".safetensors"):
+        return "safetensors"
+    if path.endswith(".int8.pth"):
+        return "int8"
+    return "pth"
+
+
+def _parse_weight(value):
+    """A cell holding model1's weight ("0.3") or one weight per model ("0.5, 0.3, 0.2"); None if empty."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float, list)):
+        return value
+    parts = [float(part) for part in str(value).replace(";", ",").split(",") if part.strip()]
+    return parts[0] if len(parts) == 1 else parts
+
+
+def parse_pipeline_jobs(jobs):
+    """
+    Turn job sheet rows into pipeline steps.
+
+    Columns:
+        name: Unique step name that other rows use to refer to this step's result
+        model1, model2, ... modelN: Parent models. A cell holding another row's name uses that
+                                    row's blend; anything else is a checkpoint path.
+        sid1, sid2, ...: Optional speaker ids for the blend info (default 0)
+        weight: model1's weight for two parents, or one weight per parent ("0.5, 0.3, 0.2").
+                Empty means equal weights.
+        rules: Optional JSON list of blend rules, e.g. [{"layers": "dec.*", "weight": 0.2}]
+        output: Optional output path (.pth, .safetensors or .int8.pth for the compact int8
+                form, see quantized_format). Only rows with an output are
+                written to disk; rows without one are intermediates kept in memory.
+
+    Args:
+        jobs (list): Row dicts, e.g. from load_job_sheet
+    Returns:
+        OrderedDict: {name: {"parents": [...], "sids": [...], "weight": ..., "rules": [...],
+                     "output": ...}} in sheet order. A parent is ("step", name) or ("file", path).
+    Raises:
+        ValueError: For duplicate or missing names, rows with fewer than two parents,
+                    dependency cycles and steps whose result is never used
+    """
+    rows = OrderedDict()
+    for number, job in enumerate(jobs, start=1):
+        name = job.get("name")
+        if not name:
+            raise ValueError(f"Row {number} has no name")
+        if name in rows:
+            raise ValueError(f"Row {number}: the name '{name}' is used twice")
+        rows[name] = job
+
+    steps = OrderedDict()
+    for name, job in rows.items():
+        model_columns = sorted(
+            (key for key in job if key.startswith("model") and key[5:].isdigit() and job[key]),
+            key=lambda key: int(key[5:]),
+        )
+        if len(model_columns) < 2:
+            raise ValueError(f"Step '{name}' needs at least two parents (model1, model2)")
+        parents = [("step", job[key]) if job[key] in rows else ("file", job[key]) for key in model_columns]
+        rules = job.get("rules") or []
+        if isinstance(rules, str):
+            rules = json.loads(rules)
+        steps[name] = {
+            "parents": parents,
+            "sids": [int(float(job.get(f"sid{key[5:]}") or 0)) for key in model_columns],
+            "weight": _parse_weight(job.get("weight")),
+            "rules": rules,
+            "output": job.get("output"),
+        }
+
+    # Depth-first search for cycles
+    state = {}
+    def visit(name, trail):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "active":
+            raise ValueError(f"Dependency cycle: {' -> '.join(trail + [name])}")
+        state[name] = "active"
+        for kind, parent in steps[name]["parents"]:
+            if kind == "step":
+                visit(parent, trail + [name])
+        state[name] = "done"
+    for name in steps:
+        visit(name, [])
+
+    used = {parent for step in steps.values() for kind, parent in step["parents"] if kind == "step"}
+    unused = [name for name, step in steps.items() if not step["output"] and name not in used]
+    if unused:
+        raise ValueError(f"Steps {unused} have no output and no other step uses them")
+    return steps
+
+
+def run_blend_pipeline(jobs, max_workers=2, mmap=True, metrics=None):
+    """
+    Run a multi-step blend (e.g. blend A with B, then that result with C) in one process.
+
+    Steps form a dependency graph. Each step is computed once, as soon as its parents are
+    ready, and independent branches run in parallel on a thread pool. Intermediate results
+    stay in memory as fp16 weight dicts (exactly what writing and reloading them would give)
+    until the last step that needs them has finished. Parent checkpoints are loaded once,
+    however many steps use them. Only steps with an output are written to disk.
+
+    Args:
+        jobs (str or list): Job sheet path (.xlsx/.csv) or row dicts; see parse_pipeline_jobs
+        max_workers (int): Steps computed at the same time. Every running step holds its result
+                           in memory, so raise this only if there is room for that.
+        mmap (bool): Memory-map the parent checkpoints (see load_checkpoint)
+        metrics (BlendMetrics): Verbosity and timing sink (see blend_metrics); spans carry the step name
+    Returns:
+        OrderedDict: {name: message on success, error on failure} in sheet order. Steps whose
+                     parents failed are not run and hold an error message.
+    """
+    metrics = get_metrics(metrics, operation="blend_pipeline")
+    if isinstance(jobs, str):
+        jobs = load_job_sheet(jobs)
+    steps = parse_pipeline_jobs(jobs)
+
+    # How many steps still need each intermediate and each parent file
+    consumers = {}
+    for step in steps.values():
+        for parent in set(step["parents"]):
+            consumers[parent] = consumers.get(parent, 0) + 1
+
+    files = {}  # path -> (metadata, weights)
+    files_lock = threading.Lock()
+    path_locks = {}  # path -> lock held while the file loads, so it is loaded once
+    results = {}  # step name -> (metadata, weights)
+    outcome = OrderedDict((name, None) for name in steps)
+    failed_steps = set()
+
+    def load_file(path):
+        with metrics.span("load", path=path, mmap=mmap) as record:
+            ckpt = load_checkpoint(path, mmap=mmap)
+            weights = extract(ckpt)["weight"] if "model" in ckpt else ckpt["weight"]
+            record["bytes"] = os.path.getsize(path)
+        return checkpoint_metadata(ckpt), weights
+
+    def get_file(path):
+        with files_lock:
+            path_lock = path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            with files_lock:
+                if path in files:
+                    return files[path]
+            loaded = load_file(path)
+            with files_lock:
+                files[path] = loaded
+            return loaded
+
+    def run_step(name, step, step_results):
+        step_metrics = metrics.child(step=name)
+        # Parent files are loaded here, on the worker, so loading overlaps with other steps
+        try:
+            parents = [
+                step_results[parent] if kind == "step" else get_file(parent)
+                for kind, parent in step["parents"]
+            ]
+        except Exception as error:
+            raise ValueError(f"could not load its parents: {error}") from error
+        n_models = len(parents)
+        sr = [metadata["sr"] for metadata, _ in parents]
+        if any(value != sr[0] for value in sr):
+            raise ValueError(f"The sample rates of the parents of '{name}' are not the same: {sr}")
+        weights = [model_weights for _, model_weights in parents]
+        for i, model_weights in enumerate(weights[1:], start=2):
+            missing = [key for key in weights[0] if key not in model_weights]
+            if missing:
+                raise ValueError(f"Parent {i} of '{name}' is missing {len(missing)} layers, e.g. '{missing[0]}'")
+
+        with step_metrics.span("rules", rules=len(step["rules"])):
+            default_weights, rule_weights = resolve_blend_weights(step["rules"], step["weight"], n_models,
+                                                                  step_metrics)
+            layer_weights = resolve_layer_rules(weights[0].keys(), step["rules"]).layer_weights(
+                rule_weights, default_weights
+            )
+        with step_metrics.span("blend") as record:
+            blended = {
+                key: blend_layer(key, [model_weights[key] for model_weights in weights], layer_weights[key])
+                for key in weights[0]
+            }
+            record["layers"] = len(blended)
+            record["bytes"] = weights_nbytes(blended)
+
+        metadata = OrderedDict(parents[0][0])
+        sources = ", ".join(
+            f"{parent} (sid:{sid})" for (_, parent), sid in zip(step["parents"], step["sids"])
+        )
+        metadata["info"] = f"Blended {sources} with {len(step['rules'])} layer-specific rules"
+        if step["output"]:
+            opt = OrderedDict()
+            opt["weight"] = blended
+            opt.update(metadata)
+            output_format = _output_format(step["output"])
+            with step_metrics.span("save", format=output_format) as record:
+                save_blend(opt, step["output"], output_format)
+                record["bytes"] = os.path.getsize(step["output"])
+            metrics.log(f"Saved '{name}' to: {step['output']}")
+        return metadata, blended
+
+    def release(parent):
+        consumers[parent] -= 1
+        if consumers[parent] == 0:
+            kind, key = parent
+            if kind == "step":
+                results.pop(key, None)
+            else:
+                with files_lock:
+                    files.pop(key, None)
+
+    metrics.log(f"Starting blend pipeline: {len(steps)} steps, "
+                f"{sum(1 for step in steps.values() if step['output'])} written to disk")
+    waiting = OrderedDict(steps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while waiting or running:
+            for name, step in list(waiting.items()):
+                if len(running) >= max_workers:
+                    break
+                step_parents = [parent for kind, parent in step["parents"] if kind == "step"]
+                failed = [parent for parent in step_parents if parent in failed_steps]
+                if failed:
+                    del waiting[name]
+                    failed_steps.add(name)
+                    outcome[name] = f"Not run because step '{failed[0]}' failed"
+                    metrics.error(f"Step '{name}': {outcome[name]}")
+                    for parent in set(step["parents"]):
+                        release(parent)
+                    continue
+                if any(parent not in results for parent in step_parents):
+                    continue
+                del waiting[name]
+                step_results = {parent: results[parent] for parent in step_parents}
+                metrics.log(f"Step '{name}' started", "debug")
+                running[pool.submit(run_step, name, step, step_results)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                step = steps[name]
+                try:
+                    metadata, blended = future.result()
+                    outcome[name] = metadata["info"]
+                    if consumers.get(("step", name)):
+                        results[name] = (metadata, blended)
+                except Exception as error:
+                    metrics.error(f"Step '{name}' failed: {error}")
+                    failed_steps.add(name)
+                    outcome[name] = error
+                for parent in set(step["parents"]):
+                    release(parent)
+
+    metrics.log(f"Finished blend pipeline: {len(outcome) - len(failed_steps)} steps succeeded, "
+                f"{len(failed_steps)} failed")
+    return outcome
+
+
+if __name__ == "__main__":
+    jobs = [
+        {"name": "AB", "model1": "../models/Dalitso.pth", "model2": "../models/Danylo_V02.pth", "weight": "0.5"},
+        {"name": "ABC", "model1": "AB", "model2": "../models/Corrie.pth", "weight": "0.66",
+         "output": "../blends/ABC.pth"},
+    ]
+    print(run_blend_pipeline(jobs))
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import torch
+from collections import OrderedDict
+from blender import blend_layer, checkpoint_metadata, load_blend_parents, resolve_blend_weights, resolve_layer_rules
+from explore_model import read_checkpoint_header, TensorInfo
+
+
+RECIPE_VERSION = 1
+
+# (path, size, mtime_ns) -> sha256, so unchanged parents are hashed once per session
+_HASHES = {}
+
+
+def file_sha256(path):
+    """Return the SHA-256 of a file's content, reusing the last result while size and mtime are unchanged."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _HASHES:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha256.update(chunk)
+        _HASHES[key] = sha256.hexdigest()
+    return _HASHES[key]
+
+
+def recipe_hash(recipe):
+    """
+    Content address of a recipe: its parent hashes, layer alphas and metadata.
+
+    Parent paths and the info text are left out, so the same blend of the same files gets the
+    same address wherever the files live.
+    """
+    content = {
+        "parents": [parent["sha256"] for parent in recipe["parents"]],
+        "layer_alphas": recipe["layer_alphas"],
+        "metadata": {key: value for key, value in recipe["metadata"].items() if key != "info"},
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def create_recipe(recipe_path, models, blend_rules, default_weight=0.5):
+    """
+    Write a blend recipe instead of a blended model.
+
+    A recipe is a small JSON file holding the parents' content hashes, the resolved weights of
+    every layer and the RVC metadata; it fully determines the blend. Only checkpoint headers are
+    read, so no tensors are loaded. Use materialize() to build the real .pth when it is needed.
+
+    Args:
+        recipe_path (str): Output path, e.g. "../blends/Dalitso_Danylo_030.recipe.json"
+        models (list): [{"path": "path/to/model1", "sid": 0}, {"path": "path/to/model2", "sid": 0}, ...]
+        blend_rules (list): Rules as for blend_models ("weight") or blend_n_models ("weights")
+        default_weight (float or list): model1's weight for two models, or one weight per model
+    Returns:
+        dict: The recipe
+    """
+    headers = [read_checkpoint_header(model["path"]) for model in models]
+    for i, header in enumerate(headers[1:], start=2):
+        if header.get("sr") != headers[0].get("sr"):
+            raise ValueError(f"The sample rates of model 1 and model {i} are not the same.")
+    layers = headers[0]["model"] if "model" in headers[0] else headers[0]["weight"]
+    layer_keys = [key for key, value in layers.items() if isinstance(value, TensorInfo) and "enc_q" not in key]
+
+    n_models = len(models)
+    default_weights, rule_weights = resolve_blend_weights(blend_rules, default_weight, n_models)
+    layer_alphas = resolve_layer_rules(layer_keys, blend_rules).layer_weights(rule_weights, default_weights)
+
+    metadata = dict(checkpoint_metadata(headers[0]))
+    sources = ", ".join(f"{m['path']} (sid:{m['sid']})" for m in models)
+    metadata["info"] = f"Blended {sources} with {len(blend_rules)} layer-specific rules"
+    recipe = {
+        "recipe_version": RECIPE_VERSION,
+        "parents": [
+            {"path": model["path"], "sid": model["sid"], "sha256": file_sha256(model["path"])}
+            for model in models
+        ],
+        "layer_alphas": layer_alphas,
+        "metadata": metadata,
+    }
+    recipe["hash"] = recipe_hash(recipe)
+    with open(recipe_path, "w", encoding="utf-8") as f:
+        json.dump(recipe, f, indent=1)
+    print(f"Wrote blend recipe {recipe_path} ({recipe['hash'][:12]})")
+    return recipe
+
+
+def load_recipe(recipe_path):
+    """Read a recipe written by create_recipe."""
+    with open(recipe_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _evict(cache_dir, max_cache_bytes, keep):
+    """Delete the least recently used cached models until the cache fits in max_cache_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".pth"):
+            continue
+        path = os.path.join(cache_dir, name)
+        st = os.stat(path)
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_cache_bytes:
+            break
+        if path == keep:
+            continue
+        os.remove(path)
+        total -= size
+        print(f"Evicted {path} from the blend cache")
+
+
+def materialize(recipe, cache_dir, max_cache_bytes=20 * 1024**3):
+    """
+    Return the path of the blended .pth for a recipe, building it only if it is not cached yet.
+
+    Built models are stored as cache_dir/<recipe hash>.pth, so identical recipes are computed
+    only once. Using a cached model marks it as recently used; when the cache grows beyond
+    max_cache_bytes the least recently used models are deleted.
+
+    Args:
+        recipe (str or dict): Recipe path or the recipe itself
+        cache_dir (str): Folder for the content-addressed cache
+        max_cache_bytes (int): Size limit of the cache folder
+    Returns:
+        str: Path of the .pth, ready for inference
+    """
+    if isinstance(recipe, str):
+        recipe = load_recipe(recipe)
+    os.makedirs(cache_dir, exist_ok=True)
+    output_path = os.path.join(cache_dir, f"{recipe_hash(recipe)}.pth")
+    if os.path.exists(output_path):
+        os.utime(output_path)  # mark as recently used
+        return output_path
+
+    for parent in recipe["parents"]:
+        if file_sha256(parent["path"]) != parent["sha256"]:
+            raise ValueError(f"{parent['path']} has changed since the recipe was written")
+
+    start = time.perf_counter()
+    models = [{"path": parent["path"], "sid": parent["sid"]} for parent in recipe["parents"]]
+    _, weights, error_message = load_blend_parents(models, mmap=True)
+    if error_message:
+        raise ValueError(error_message)
+    opt = OrderedDict()
+    opt["weight"] = {
+        key: blend_layer(key, [model_weights[key] for model_weights in weights], alphas)
+        for key, alphas in recipe["layer_alphas"].items()
+    }
+    opt.update(recipe["metadata"])
+
+    # Write under a unique name first so concurrent materializations never see a partial file
+    temp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    torch.save(opt, temp_path)
+    os.replace(temp_path, output_path)
+    print(f"Materialized blend {output_path} in {time.perf_counter() - start:.1f}s")
+    _evict(cache_dir, max_cache_bytes, keep=output_path)
+    return output_path
+
+
+def resolve_model_path(path, cache_dir, max_cache_bytes=20 * 1024**3):
+    """
+    Turn a model path that may point to a recipe into a loadable .pth path.
+
+    Args:
+        path (str): A .pth path, or a recipe ending in .recipe.json
+        cache_dir (str): Cache folder for materialized recipes
+        max_cache_bytes (int): Size limit of the cache folder
+    Returns:
+        str: A .pth path
+    """
+    if path.endswith(".recipe.json"):
+        return materialize(path, cache_dir, max_cache_bytes)
+    return path
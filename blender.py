@@ -1,7 +1,17 @@
+import io
 import os
+import re
+import sys
+import hashlib
 import torch
+import pickle
 import fnmatch
-from collections import OrderedDict
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from blend_metrics import get_metrics
+from checkpoint_cache import cached_load
+from quantized_format import dequantize_checkpoint
 
 
 def extract(ckpt):
@@ -15,14 +25,305 @@ def extract(ckpt):
     return opt
 
 
-def find_matching_layers(layer_keys, pattern):
+# Storage classes torch.save records for each dtype. All of them are accepted by
+# the weights_only unpickler, so streamed checkpoints load exactly like saved ones.
+_STORAGE_TYPES = {
+    torch.float16: "HalfStorage",
+    torch.bfloat16: "BFloat16Storage",
+    torch.float32: "FloatStorage",
+    torch.int8: "CharStorage",
+    torch.uint8: "ByteStorage",
+    torch.int64: "LongStorage",
+}
+
+
+def _check_streaming_support():
+    """
+    Fail clearly if this torch version lacks the private APIs StreamingCheckpointWriter is built on.
+
+    torch.save has no public API for writing one tensor at a time, so the writer uses the same
+    zip writer (torch._C.PyTorchFileWriter) and tensor rebuild function (torch._utils._rebuild_tensor_v2)
+    as torch.save itself. Both have been stable since torch 1.6.
+    """
+    missing = [
+        name for name, available in (
+            ("torch._C.PyTorchFileWriter", hasattr(torch._C, "PyTorchFileWriter")),
+            ("torch._utils._rebuild_tensor_v2", hasattr(torch._utils, "_rebuild_tensor_v2")),
+        )
+        if not available
+    ]
+    if missing:
+        raise RuntimeError(f"Streaming blends are not supported with torch {torch.__version__}: "
+                           f"{', '.join(missing)} is missing. Blend with stream=False instead.")
+
+
+class _StorageRef:
+    """Placeholder for a storage record that has already been written to the archive."""
+
+    def __init__(self, key, dtype, numel):
+        self.key = key
+        self.dtype = dtype
+        self.numel = numel
+
+
+class _TensorRef:
+    """Placeholder that pickles exactly like a contiguous CPU tensor backed by a _StorageRef."""
+
+    def __init__(self, storage, shape, stride):
+        self.storage = storage
+        self.shape = tuple(shape)
+        self.stride = tuple(stride)
+
+    def __reduce__(self):
+        return (
+            torch._utils._rebuild_tensor_v2,
+            (self.storage, 0, self.shape, self.stride, False, OrderedDict()),
+        )
+
+
+class _CheckpointPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, _StorageRef):
+            storage_type = getattr(torch, _STORAGE_TYPES[obj.dtype])
+            return ("storage", storage_type, obj.key, "cpu", obj.numel)
+        return None
+
+
+class StreamingCheckpointWriter:
+    """
+    Write a checkpoint in the torch.save zip layout one tensor at a time.
+
+    Each tensor passed to add_weight is written to disk immediately, so the caller can
+    release it before computing the next one. finish() pickles the checkpoint dict
+    (weight, then the metadata in the order given) and closes the archive; the zip writer
+    adds the .data/version record as it does for torch.save. The result loads with
+    torch.load(..., weights_only=True) like any other RVC .pth file (tests/test_blender.py
+    checks this against an in-memory blend). If the blend fails, call close() and delete
+    the incomplete file.
+
+    Args:
+        path (str): Output .pth path
+    Raises:
+        RuntimeError: If this torch version lacks the private APIs the writer needs
+    """
+
+    def __init__(self, path):
+        _check_streaming_support()
+        self.path = path
+        self._writer = torch._C.PyTorchFileWriter(str(path))
+        self._weights = {}
+        self.bytes_written = 0
+
+    def add_weight(self, key, tensor):
+        tensor = tensor.detach().cpu().contiguous()
+        storage = tensor.untyped_storage()
+        num_bytes = tensor.numel() * tensor.element_size()
+        if tensor.storage_offset() != 0 or storage.nbytes() != num_bytes:
+            # Views into a larger buffer must not drag the whole buffer into the file
+            tensor = tensor.clone()
+            storage = tensor.untyped_storage()
+        storage_key = str(len(self._weights))
+        self._writer.write_record(f"data/{storage_key}", storage, num_bytes)
+        self._weights[key] = _TensorRef(
+            _StorageRef(storage_key, tensor.dtype, tensor.numel()), tensor.shape, tensor.stride()
+        )
+        self.bytes_written += num_bytes
+
+    def finish(self, metadata):
+        opt = OrderedDict()
+        opt["weight"] = self._weights
+        opt.update(metadata)
+        buffer = io.BytesIO()
+        _CheckpointPickler(buffer, protocol=2).dump(opt)
+        data = buffer.getvalue()
+        self._writer.write_record("data.pkl", data, len(data))
+        self._writer.write_record("byteorder", sys.byteorder, len(sys.byteorder))
+        self._writer.write_end_of_file()
+        self._writer = None
+
+    def close(self):
+        """Close the file. Without finish() it is not a loadable checkpoint and should be deleted."""
+        self._writer = None  # the zip writer closes its file when released
+
+
+def load_checkpoint(path, mmap=False, cache=None):
+    """
+    Load a .pth checkpoint onto the CPU.
+
+    Args:
+        path (str): Path to the checkpoint
+        mmap (bool): If True, memory-map the tensor storage instead of reading it into RAM.
+                     Only the pages that are actually touched get read from disk.
+        cache (bool): Load through the process-wide checkpoint cache, so loading the same
+                      unchanged file again is free. The tensors are then shared with the
+                      cache and must not be modified in place (see checkpoint_cache).
+                      Default: cache full loads, but not memory-mapped ones, so streaming
+                      blends keep their low peak memory.
+    Returns:
+        dict: The checkpoint. Compact int8 files (see quantized_format) are dequantized
+              to the standard "weight" layout.
+    """
+    if cache is None:
+        cache = not mmap
+    if cache:
+        ckpt = cached_load(path, mmap=mmap)
+    else:
+        ckpt = torch.load(path, map_location="cpu", weights_only=True, mmap=mmap)
+    return dequantize_checkpoint(ckpt)
+
+
+# Resolved rule tables keyed by (layer signature, rule patterns), most recently used last
+_RULE_TABLE_CACHE = OrderedDict()
+_RULE_TABLE_CACHE_SIZE = 64
+_RULE_TABLE_LOCK = threading.Lock()
+
+
+def layer_signature(layer_keys):
+    """Hash of a model's layer names. Models with the same architecture share a signature."""
+    return hashlib.sha1("\n".join(layer_keys).encode("utf-8")).hexdigest()
+
+
+class CompiledBlendRules:
+    """
+    All fnmatch patterns of a rule list combined into one regular expression.
+
+    Alternatives are ordered from the last rule to the first, so the first alternative that
+    matches a layer is the rule that wins under blend_models' "later rules override earlier
+    ones" behaviour.
+
+    Args:
+        patterns (list): fnmatch-style layer patterns, e.g. ["emb_g.weight", "dec.cond.*"]
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        alternatives = [
+            f"(?P<rule{i}>{fnmatch.translate(pattern)})"
+            for i, pattern in reversed(list(enumerate(self.patterns)))
+        ]
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+        if self._regex is not None:
+            self._groups = [
+                (self._regex.groupindex[f"rule{i}"], i) for i in reversed(range(len(self.patterns)))
+            ]
+
+    def winner(self, key):
+        """Return the index of the rule that applies to key, or None if no rule matches."""
+        if self._regex is None:
+            return None
+        match = self._regex.match(key)
+        if match is None:
+            return None
+        for group, rule_index in self._groups:
+            if match.start(group) != -1:
+                return rule_index
+        return None
+
+
+class LayerRuleTable:
+    """
+    The rule that won for every layer of a model architecture.
+
+    Args:
+        patterns (tuple): The rule patterns the table was resolved for
+        winners (dict): {layer key: index of the winning rule, or None for the default weight}
+    """
+
+    def __init__(self, patterns, winners):
+        self.patterns = patterns
+        self.winners = winners
+
+    def layer_weights(self, rule_weights, default_weight):
+        """Map every layer to its rule's weight (rule_weights[i] for rule i) or default_weight."""
+        return {
+            key: default_weight if rule_index is None else rule_weights[rule_index]
+            for key, rule_index in self.winners.items()
+        }
+
+    def winning_rule(self, key):
+        """Return (rule index, pattern) of the rule that won for key, or None if it uses the default."""
+        rule_index = self.winners[key]
+        return None if rule_index is None else (rule_index, self.patterns[rule_index])
+
+    def rule_counts(self):
+        """Return how many layers each rule won, in rule order."""
+        counts = [0] * len(self.patterns)
+        for rule_index in self.winners.values():
+            if rule_index is not None:
+                counts[rule_index] += 1
+        return counts
+
+
+def resolve_layer_rules(layer_keys, blend_rules):
+    """
+    Resolve which blend rule applies to each layer, in a single pass over the layer keys.
+
+    Tables are cached per architecture (layer signature) and rule patterns, so repeated blends
+    of same-architecture models skip rule matching entirely.
+
+    Args:
+        layer_keys (iterable): Layer names of the model
+        blend_rules (list): [{"layers": "pattern", ...}, ...]
+    Returns:
+        LayerRuleTable: The resolved table
+    """
+    layer_keys = list(layer_keys)
+    patterns = tuple(rule["layers"] for rule in blend_rules)
+    cache_key = (layer_signature(layer_keys), patterns)
+    with _RULE_TABLE_LOCK:
+        table = _RULE_TABLE_CACHE.get(cache_key)
+        if table is not None:
+            _RULE_TABLE_CACHE.move_to_end(cache_key)
+            return table
+
+    compiled = CompiledBlendRules(patterns)
+    table = LayerRuleTable(patterns, {key: compiled.winner(key) for key in layer_keys})
+    with _RULE_TABLE_LOCK:  # blend_pipeline and blend_sweep resolve rules from several threads
+        _RULE_TABLE_CACHE[cache_key] = table
+        if len(_RULE_TABLE_CACHE) > _RULE_TABLE_CACHE_SIZE:
+            _RULE_TABLE_CACHE.popitem(last=False)
+    return table
+
+
+def save_blend(opt, output_path, output_format="pth"):
+    """
+    Save a blended model.
+
+    Args:
+        opt (dict): {"weight": {...}, "config": ..., "sr": ..., "f0": ..., "version": ..., "vocoder": ..., "info": ...}
+        output_path (str): Output path
+        output_format (str): "pth" for torch.save, "safetensors" for a flat zero-copy file
+                             (see safetensors_format), "int8" for the compact per-channel int8
+                             form (see quantized_format; load it with load_quantized)
+    """
+    if output_format == "safetensors":
+        from safetensors_format import save_safetensors
+        save_safetensors(opt, output_path)
+    elif output_format == "int8":
+        from quantized_format import save_quantized
+        save_quantized(opt, output_path)
+    elif output_format == "pth":
+        torch.save(opt, output_path)
+    else:
+        raise ValueError(f"output_format must be 'pth', 'safetensors' or 'int8', not {output_format!r}")
+
+
+def find_matching_layers(layer_keys, pattern, metrics=None):
     """Find all layer keys that match the given pattern using fnmatch."""
     matching = [key for key in layer_keys if fnmatch.fnmatch(key, pattern)]
-    print(f"      🔍 Pattern '{pattern}' matched: {matching[:3]}{'...' if len(matching) > 3 else ''}")
+    (metrics or get_metrics()).log(
+        f"Pattern '{pattern}' matched: {matching[:3]}{'...' if len(matching) > 3 else ''}", "debug"
+    )
     return matching
 
 
-def blend_models(output_path, model1, model2, blend_rules, default_weight=0.5):
+def weights_nbytes(weights):
+    """Total size in bytes of the tensors in a weight dict."""
+    return sum(tensor.numel() * tensor.element_size() for tensor in weights.values())
+
+
+def blend_models(output_path, model1, model2, blend_rules, default_weight=0.5, stream=False, catalog=None,
+                 output_format="pth", metrics=None):
     """
     Blend two models with granular control over individual layers.
     
@@ -33,112 +334,132 @@ def blend_models(output_path, model1, model2, blend_rules, default_weight=0.5):
         blend_rules (list): [{"layers": "pattern", "weight": 0.3}, ...]
                            weight determines model1's contribution (0.0 = all model2, 1.0 = all model1)
         default_weight (float): Default weight for layers not specified in blend_rules
+        stream (bool): If True, memory-map both input models and write each blended layer to
+                       output_path as soon as it is computed, so peak memory stays around the
+                       size of the largest layer instead of three full models.
+        catalog (ModelCatalog): Optional model_catalog.ModelCatalog used to reject incompatible
+                                models before loading them
+        output_format (str): "pth" (default), "safetensors" or "int8" (see save_blend).
+                             Streaming always writes .pth.
+        metrics (BlendMetrics): Verbosity and timing sink (see blend_metrics). Defaults to the
+                                process-wide metrics set with blend_metrics.configure_metrics.
     Returns:
         str: message on success, error on failure
     """
+    metrics = get_metrics(metrics, operation="blend_models", output_path=output_path)
+
+    # Clamp default weight between 0.0 and 1.0 (rule weights may extrapolate, see resolve_blend_weights)
+    default_weight = blend_weight_vector(default_weight, 2, metrics, clamp=True)[0]
 
-    # Clamp default weight between 0.0 and 1.0
-    clamped_default_weight = max(0.0, min(1.0, default_weight))
-    if clamped_default_weight != default_weight:
-        print(f"⚠️  default_weight was not in range 0 to 1. Clamped to {clamped_default_weight}")
-        default_weight = clamped_default_weight
+    if stream and output_format != "pth":
+        return "Streaming blends can only be written as .pth files."
 
+    writer = None
     try:
-        print(f"🔄 Starting blend operation: '{output_path}'")
-        print(f"📁 Model 1: {model1['path']} (sid: {model1['sid']})")
-        print(f"📁 Model 2: {model2['path']} (sid: {model2['sid']})")
-        print(f"⚙️  Blend rules: {len(blend_rules)} rules defined")
+        metrics.log(f"Starting blend operation: '{output_path}'")
+        metrics.log(f"Model 1: {model1['path']} (sid: {model1['sid']})", "debug")
+        metrics.log(f"Model 2: {model2['path']} (sid: {model2['sid']})", "debug")
+
+        if catalog is not None:
+            with metrics.span("validate", stage="catalog"):
+                reason = catalog.check_compatible(model1["path"], model2["path"])
+            if reason:
+                metrics.error(reason)
+                return reason
         
-        # Load models
-        print("🔧 Loading model 1...")
-        ckpt1 = torch.load(model1["path"], map_location="cpu", weights_only=True)
-        print("🔧 Loading model 2...")
-        ckpt2 = torch.load(model2["path"], map_location="cpu", weights_only=True)
-        print("✅ Both models loaded successfully")
+        # Load models. Unless streaming they come from the checkpoint cache, so their tensors
+        # are shared with it: only out-of-place operations below.
+        with metrics.span("load", mmap=stream) as record:
+            ckpt1 = load_checkpoint(model1["path"], mmap=stream)
+            ckpt2 = load_checkpoint(model2["path"], mmap=stream)
+            record["bytes"] = os.path.getsize(model1["path"]) + os.path.getsize(model2["path"])
 
         # Basic compatibility checks
-        print("🔍 Checking model compatibility...")
-        if ckpt1["sr"] != ckpt2["sr"]:
-            print("❌ Sample rate mismatch!")
+        with metrics.span("validate", stage="sample_rate"):
+            sr_mismatch = ckpt1["sr"] != ckpt2["sr"]
+        if sr_mismatch:
+            metrics.error("The sample rates of the two models are not the same.")
             return "The sample rates of the two models are not the same."
-        print(f"✅ Sample rates match: {ckpt1['sr']} Hz")
 
         # Extract metadata from first model
-        print("📊 Extracting metadata from model 1...")
         cfg = ckpt1["config"]
         cfg_f0 = ckpt1["f0"]
         cfg_version = ckpt1["version"]
         cfg_sr = ckpt1["sr"]
         vocoder = ckpt1.get("vocoder", "HiFi-GAN")
-        print(f"   Version: {cfg_version}, F0: {cfg_f0}, Vocoder: {vocoder}")
+        metrics.log(f"Version: {cfg_version}, F0: {cfg_f0}, Vocoder: {vocoder}, SR: {cfg_sr}", "debug")
 
         # Extract weights
-        print("⚖️  Extracting weights from models...")
-        if "model" in ckpt1:
-            weights1 = extract(ckpt1)["weight"]
-        else:
-            weights1 = ckpt1["weight"]
-            
-        if "model" in ckpt2:
-            weights2 = extract(ckpt2)["weight"]
-        else:
-            weights2 = ckpt2["weight"]
-        
-        print(f"   Model 1 has {len(weights1)} layers")
-        print(f"   Model 2 has {len(weights2)} layers")
+        with metrics.span("extract") as record:
+            if "model" in ckpt1:
+                weights1 = extract(ckpt1)["weight"]
+            else:
+                weights1 = ckpt1["weight"]
+
+            if "model" in ckpt2:
+                weights2 = extract(ckpt2)["weight"]
+            else:
+                weights2 = ckpt2["weight"]
+            record["layers"] = len(weights1)
+            record["bytes"] = weights_nbytes(weights1) + weights_nbytes(weights2)
 
         # Build layer weight mapping from blend rules
-        print("🎛️  Processing blend rules...")
-        layer_weights = {}
-        for i, rule in enumerate(blend_rules):
-            pattern = rule["layers"]
-            weight = rule["weight"]
-            print(f"   Rule {i+1}:")
-            matching_layers = find_matching_layers(weights1.keys(), pattern)
-            print(f"       '{pattern}' (weight: {weight}) → {len(matching_layers)} layers")
-            for layer in matching_layers:
-                layer_weights[layer] = weight
-        
-        print(f"📋 Total layers with specific weights: {len(layer_weights)}")
-        unspecified_layers = len(weights1) - len(layer_weights)
-        if unspecified_layers > 0:
-            print(f"📋 Layers using default weight ({default_weight}): {unspecified_layers}")
+        with metrics.span("rules", rules=len(blend_rules)) as record:
+            rule_table = resolve_layer_rules(weights1.keys(), blend_rules)
+            _, rule_weights = resolve_blend_weights(blend_rules, default_weight, 2, metrics)
+            layer_weights = rule_table.layer_weights([weights[0] for weights in rule_weights], default_weight)
+            unspecified_layers = sum(rule_index is None for rule_index in rule_table.winners.values())
+            record["layers"] = len(layer_weights) - unspecified_layers
+        for i, (rule, count) in enumerate(zip(blend_rules, rule_table.rule_counts())):
+            metrics.log(f"Rule {i+1}: '{rule['layers']}' (weight: {rule['weight']}) -> {count} layers", "debug")
+        metrics.log(
+            f"{len(layer_weights) - unspecified_layers} layers with specific weights, "
+            f"{unspecified_layers} using the default weight ({default_weight})"
+        )
 
         # Create blended model
-        print("🔀 Starting layer blending process...")
         opt = OrderedDict()
         opt["weight"] = {}
+        if stream:
+            writer = StreamingCheckpointWriter(output_path)
         
-        processed_layers = 0
         special_layers = 0
-        
-        for key in weights1.keys():
-            # Get blend weight for this layer (default to default_weight if not specified)
-            alpha = layer_weights.get(key, default_weight)
-
-            # Handle speaker embedding special case
-            if key == "emb_g.weight" and weights1[key].shape != weights2[key].shape:
-                print(f"   🔧 Special handling for '{key}': shape mismatch {weights1[key].shape} vs {weights2[key].shape}")
-                min_shape0 = min(weights1[key].shape[0], weights2[key].shape[0])
-                opt["weight"][key] = (
-                    alpha * (weights1[key][:min_shape0].float())
-                    + (1 - alpha) * (weights2[key][:min_shape0].float())
-                ).half()
-                special_layers += 1
-            else:
-                # Standard layer blending
-                opt["weight"][key] = (
-                    alpha * (weights1[key].float()) + (1 - alpha) * (weights2[key].float())
-                ).half()
-            
-            processed_layers += 1
-            if processed_layers % 50 == 0:  # Progress update every 50 layers
-                print(f"   📊 Processed {processed_layers}/{len(weights1)} layers...")
-        
-        print(f"✅ Blending complete! Processed {processed_layers} layers ({special_layers} with special handling)")
+        with metrics.span("blend", stream=stream) as record:
+            blended_bytes = 0
+            for key in weights1.keys():
+                # Get blend weight for this layer (default to default_weight if not specified)
+                alpha = layer_weights[key]
+
+                # Handle speaker embedding special case
+                if key == "emb_g.weight" and weights1[key].shape != weights2[key].shape:
+                    metrics.log(
+                        f"Special handling for '{key}': shape mismatch {weights1[key].shape} vs {weights2[key].shape}",
+                        "debug",
+                    )
+                    min_shape0 = min(weights1[key].shape[0], weights2[key].shape[0])
+                    blended = (
+                        alpha * (weights1[key][:min_shape0].float())
+                        + (1 - alpha) * (weights2[key][:min_shape0].float())
+                    ).half()
+                    special_layers += 1
+                else:
+                    # Standard layer blending
+                    blended = (
+                        alpha * (weights1[key].float()) + (1 - alpha) * (weights2[key].float())
+                    ).half()
 
+                blended_bytes += blended.numel() * blended.element_size()
+                if writer is not None:
+                    # Write the layer out now and drop it before blending the next one
+                    writer.add_weight(key, blended)
+                else:
+                    opt["weight"][key] = blended
+                del blended
+            record["layers"] = len(weights1)
+            record["special_layers"] = special_layers
+            record["bytes"] = blended_bytes
+        
         # Add metadata
-        print("📝 Adding metadata to blended model...")
         opt["config"] = cfg
         opt["sr"] = cfg_sr
         opt["f0"] = cfg_f0
@@ -150,20 +471,387 @@ def blend_models(output_path, model1, model2, blend_rules, default_weight=0.5):
         opt["info"] = blend_info
 
         # Save blended model
-        print("💾 Saving blended model...")
-        torch.save(opt, output_path)
-        print(f"🎉 Successfully saved blended model to: {output_path}")
+        with metrics.span("save", format=output_format) as record:
+            if writer is not None:
+                del opt["weight"]
+                writer.finish(opt)
+                writer = None
+            else:
+                save_blend(opt, output_path, output_format)
+            record["bytes"] = os.path.getsize(output_path)
+        metrics.log(f"Saved blended model to: {output_path}")
         
-        print(blend_info)
+        metrics.log(blend_info, "debug")
         return blend_info
         
     except Exception as error:
-        print(f"❌ An error occurred blending the models: {error}")
-        print(f"🔍 Error type: {type(error).__name__}")
+        metrics.error(f"An error occurred blending the models ({type(error).__name__}): {error}")
         return error
+    finally:
+        if writer is not None:
+            # Don't leave a truncated archive behind
+            writer.close()
+            if os.path.exists(output_path):
+                os.remove(output_path)
 
   
 
+def normalize_blend_weights(weights, n_models, metrics=None):
+    """
+    Clamp a weight vector to non-negative values and scale it to sum to 1.
+
+    Args:
+        weights (list): One weight per model
+        n_models (int): Number of models being blended
+        metrics (BlendMetrics): Where to report the normalization (see blend_metrics)
+    Returns:
+        list: The normalized weights
+    """
+    if len(weights) != n_models:
+        raise ValueError(f"Expected {n_models} weights, got {len(weights)}: {weights}")
+    clamped = [max(0.0, float(w)) for w in weights]
+    total = sum(clamped)
+    if total == 0:
+        raise ValueError(f"Weights must not all be zero: {weights}")
+    normalized = [w / total for w in clamped]
+    if normalized != list(weights):
+        (metrics or get_metrics()).log(
+            f"Weights {list(weights)} normalized to {[round(w, 4) for w in normalized]}", "debug"
+        )
+    return normalized
+
+
+def load_blend_parents(models, mmap=False, metrics=None):
+    """
+    Load the parent models of a blend and check that they can be blended together.
+
+    Args:
+        models (list): [{"path": "path/to/model1", "sid": 0}, ...]
+        mmap (bool): If True, memory-map the checkpoints (see load_checkpoint)
+        metrics (BlendMetrics): Records the load, validate and extract spans (see blend_metrics)
+    Returns:
+        tuple: (checkpoints, weight dicts, error message). The error message is None when
+               the models are compatible.
+    """
+    metrics = metrics or get_metrics()
+    # Full loads come from the checkpoint cache: callers must not modify the tensors in place
+    with metrics.span("load", mmap=mmap, models=len(models)) as record:
+        ckpts = [load_checkpoint(model["path"], mmap=mmap) for model in models]
+        record["bytes"] = sum(os.path.getsize(model["path"]) for model in models)
+
+    # Basic compatibility checks
+    with metrics.span("validate", stage="sample_rate"):
+        mismatch = next((i for i, ckpt in enumerate(ckpts[1:], start=2) if ckpt["sr"] != ckpts[0]["sr"]), None)
+    if mismatch is not None:
+        return ckpts, None, f"The sample rates of model 1 and model {mismatch} are not the same."
+
+    # Extract weights
+    with metrics.span("extract") as record:
+        weights = [extract(ckpt)["weight"] if "model" in ckpt else ckpt["weight"] for ckpt in ckpts]
+        record["layers"] = len(weights[0])
+        record["bytes"] = sum(weights_nbytes(model_weights) for model_weights in weights)
+    with metrics.span("validate", stage="layers"):
+        for i, model_weights in enumerate(weights[1:], start=2):
+            missing = [key for key in weights[0] if key not in model_weights]
+            if missing:
+                return ckpts, None, f"Model {i} is missing {len(missing)} layers of model 1, e.g. '{missing[0]}'."
+    return ckpts, weights, None
+
+
+def checkpoint_metadata(ckpt):
+    """Return the RVC metadata (config, sr, f0, version, vocoder) of a checkpoint, in .pth order."""
+    metadata = OrderedDict()
+    metadata["config"] = ckpt["config"]
+    metadata["sr"] = ckpt["sr"]
+    metadata["f0"] = ckpt["f0"]
+    metadata["version"] = ckpt["version"]
+    metadata["vocoder"] = ckpt.get("vocoder", "HiFi-GAN")
+    return metadata
+
+
+def blend_layer(key, tensors, alphas):
+    """
+    Blend one layer of several models as a weighted sum and return it as fp16.
+
+    Args:
+        key (str): Layer name. "emb_g.weight" is truncated to the rows all models share
+                   when the speaker counts differ.
+        tensors (list): The layer's tensor from each model
+        alphas (list): One weight per model
+    Returns:
+        torch.Tensor: The blended layer
+    """
+    if key == "emb_g.weight" and len({t.shape for t in tensors}) > 1:
+        min_shape0 = min(t.shape[0] for t in tensors)
+        tensors = [t[:min_shape0] for t in tensors]
+
+    blended = alphas[0] * tensors[0].float()
+    for alpha, tensor in zip(alphas[1:], tensors[1:]):
+        blended.add_(tensor.float(), alpha=alpha)
+    return blended.half()
+
+
+def blend_n_models(output_path, models, blend_rules, default_weights=None, stream=False, catalog=None,
+                   output_format="pth", metrics=None):
+    """
+    Blend any number of models in a single pass with granular control over individual layers.
+
+    Every output layer is computed as one weighted sum over all models, so a three-way blend
+    reads each parent once and never writes an intermediate model to disk.
+
+    Args:
+        output_path (str): Relative path including name for the output blended model
+        models (list): [{"path": "path/to/model1", "sid": 0}, {"path": "path/to/model2", "sid": 0}, ...]
+        blend_rules (list): [{"layers": "pattern", "weights": [0.5, 0.3, 0.2]}, ...]
+                            one weight per model, in the same order as models. Weights are
+                            normalized to sum to 1. Later rules override earlier ones.
+        default_weights (list): Weights for layers not specified in blend_rules (default: equal weights)
+        stream (bool): If True, memory-map the input models and write each blended layer to
+                       output_path as soon as it is computed (see blend_models)
+        catalog (ModelCatalog): Optional catalog used to reject incompatible models before loading them
+        output_format (str): "pth" (default), "safetensors" or "int8" (see save_blend).
+                             Streaming always writes .pth.
+        metrics (BlendMetrics): Verbosity and timing sink (see blend_metrics)
+    Returns:
+        str: message on success, error on failure
+    """
+    if stream and output_format != "pth":
+        return "Streaming blends can only be written as .pth files."
+
+    metrics = get_metrics(metrics, operation="blend_n_models", output_path=output_path)
+    writer = None
+    try:
+        n_models = len(models)
+        if n_models < 2:
+            return "At least two models are needed for a blend."
+        default_weights, rule_weights = resolve_blend_weights(blend_rules, default_weights, n_models, metrics)
+
+        metrics.log(f"Starting {n_models}-way blend operation: '{output_path}'")
+        for i, model in enumerate(models):
+            metrics.log(f"Model {i+1}: {model['path']} (sid: {model['sid']})", "debug")
+
+        if catalog is not None:
+            with metrics.span("validate", stage="catalog"):
+                reason = catalog.check_compatible(*(model["path"] for model in models))
+            if reason:
+                metrics.error(reason)
+                return reason
+
+        ckpts, weights, error_message = load_blend_parents(models, mmap=stream, metrics=metrics)
+        if error_message:
+            metrics.error(error_message)
+            return error_message
+
+        # Build layer weight mapping from blend rules
+        with metrics.span("rules", rules=len(blend_rules)) as record:
+            rule_table = resolve_layer_rules(weights[0].keys(), blend_rules)
+            layer_weights = rule_table.layer_weights(rule_weights, default_weights)
+            record["layers"] = sum(rule_table.rule_counts())
+        metrics.log(f"{record['layers']} of {len(weights[0])} layers with specific weights")
+
+        # Create blended model
+        opt = OrderedDict()
+        opt["weight"] = {}
+        if stream:
+            writer = StreamingCheckpointWriter(output_path)
+
+        with metrics.span("blend", stream=stream) as record:
+            blended_bytes = 0
+            for key in weights[0].keys():
+                alphas = layer_weights[key]
+                blended = blend_layer(key, [model_weights[key] for model_weights in weights], alphas)
+                blended_bytes += blended.numel() * blended.element_size()
+                if writer is not None:
+                    writer.add_weight(key, blended)
+                else:
+                    opt["weight"][key] = blended
+                del blended
+            record["layers"] = len(weights[0])
+            record["bytes"] = blended_bytes
+
+        # Add metadata from the first model
+        opt.update(checkpoint_metadata(ckpts[0]))
+        sources = ", ".join(f"{m['path']} (sid:{m['sid']})" for m in models)
+        blend_info = f"Blended {sources} with {len(blend_rules)} layer-specific rules"
+        opt["info"] = blend_info
+
+        # Save blended model
+        with metrics.span("save", format=output_format) as record:
+            if writer is not None:
+                del opt["weight"]
+                writer.finish(opt)
+                writer = None
+            else:
+                save_blend(opt, output_path, output_format)
+            record["bytes"] = os.path.getsize(output_path)
+        metrics.log(f"Saved blended model to: {output_path}")
+
+        metrics.log(blend_info, "debug")
+        return blend_info
+
+    except Exception as error:
+        metrics.error(f"An error occurred blending the models ({type(error).__name__}): {error}")
+        return error
+    finally:
+        if writer is not None:
+            # Don't leave a truncated archive behind
+            writer.close()
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+
+def blend_weight_vector(weight, n_models, metrics=None, clamp=False):
+    """
+    Turn a blend_models-style model1 weight or a blend_n_models-style weight list into a vector.
+
+    A single weight w becomes [w, 1 - w], clamped to 0..1 only with clamp=True. Weight lists are
+    normalized (see normalize_blend_weights).
+    """
+    if isinstance(weight, (int, float)):
+        if n_models != 2:
+            raise ValueError(f"A single weight only works for two models; give {n_models} weights instead.")
+        weight = float(weight)
+        if clamp:
+            clamped = max(0.0, min(1.0, weight))
+            if clamped != weight:
+                (metrics or get_metrics()).log(f"default_weight was not in range 0 to 1. Clamped to {clamped}")
+            weight = clamped
+        return [weight, 1.0 - weight]
+    return normalize_blend_weights(weight, n_models, metrics)
+
+
+def resolve_blend_weights(blend_rules, default_weight, n_models, metrics=None):
+    """
+    Turn a blend's default weight and rule weights into one weight vector per rule.
+
+    This is the one place every blend engine (blend_models, blend_n_models, blend_sweep,
+    blend_recipe, flat_blend, blend_pipeline) gets its weights from, so the same inputs give the
+    same blend everywhere. As in blend_models, a single default weight is clamped to 0..1 while a
+    single rule weight is used as given, so rules can extrapolate (e.g. 1.2 or -0.2).
+
+    Args:
+        blend_rules (list): Rules with a model1 "weight" or a "weights" list
+        default_weight (float, list or None): model1's weight for two models, one weight per
+                                              model, or None for equal weights
+        n_models (int): Number of models being blended
+        metrics (BlendMetrics): Where to report clamping and normalization (see blend_metrics)
+    Returns:
+        tuple: (default weight vector, [weight vector of each rule])
+    """
+    if default_weight is None:
+        default_weight = [1.0] * n_models
+    default_weights = blend_weight_vector(default_weight, n_models, metrics, clamp=True)
+    rule_weights = [
+        blend_weight_vector(rule["weights"] if "weights" in rule else rule["weight"], n_models, metrics)
+        for rule in blend_rules
+    ]
+    return default_weights, rule_weights
+
+
+def blend_sweep(models, variants, max_writers=2, catalog=None, output_format="pth", metrics=None):
+    """
+    Produce many blends of the same parent models, e.g. a sweep over ratios or rule sets.
+
+    The parents are loaded and checked once, and every variant is computed from the tensors
+    already in memory. Finished blends are saved by a background writer pool, so saving one
+    variant overlaps with computing the next.
+
+    Args:
+        models (list): [{"path": "path/to/model1", "sid": 0}, {"path": "path/to/model2", "sid": 0}, ...]
+        variants (list): [(output_path, blend_rules, default_weight), ...]
+                         With two models, weights follow blend_models: {"layers": "pattern", "weight": 0.3}
+                         and a scalar default_weight for model1. With any number of models, weight
+                         lists follow blend_n_models: {"layers": "pattern", "weights": [0.5, 0.3, 0.2]}.
+        max_writers (int): Number of background threads saving blends. At most this many
+                           finished blends wait in memory to be saved.
+        catalog (ModelCatalog): Optional catalog used to reject incompatible models before loading them
+        output_format (str): "pth" (default), "safetensors" or "int8" (see save_blend)
+        metrics (BlendMetrics): Verbosity and timing sink (see blend_metrics). Each variant's
+                                spans carry its output_path.
+    Returns:
+        list: message on success, error on failure, one per variant in the same order as variants
+    """
+    metrics = get_metrics(metrics, operation="blend_sweep")
+    metrics.log(f"Starting blend sweep: {len(variants)} variants of {len(models)} models")
+    if catalog is not None:
+        with metrics.span("validate", stage="catalog"):
+            reason = catalog.check_compatible(*(model["path"] for model in models))
+        if reason:
+            metrics.error(reason)
+            return [reason] * len(variants)
+    try:
+        ckpts, weights, error_message = load_blend_parents(models, metrics=metrics)
+    except Exception as error:
+        metrics.error(f"An error occurred loading the models: {error}")
+        return [error] * len(variants)
+    if error_message:
+        metrics.error(error_message)
+        return [error_message] * len(variants)
+
+    n_models = len(models)
+    metadata = checkpoint_metadata(ckpts[0])
+    layer_keys = list(weights[0].keys())
+    # Convert once; every variant reuses the same float32 tensors
+    with metrics.span("extract", stage="float32") as record:
+        resident = {key: [model_weights[key].float() for model_weights in weights] for key in layer_keys}
+        record["bytes"] = sum(t.numel() * t.element_size() for tensors in resident.values() for t in tensors)
+    del ckpts, weights
+    sources = ", ".join(f"{m['path']} (sid:{m['sid']})" for m in models)
+
+    results = [None] * len(variants)
+    pending = deque()
+
+    def save_variant(variant_metrics, opt, output_path):
+        with variant_metrics.span("save", format=output_format) as record:
+            save_blend(opt, output_path, output_format)
+            record["bytes"] = os.path.getsize(output_path)
+
+    def collect(index, output_path, blend_info, future):
+        try:
+            future.result()
+            metrics.log(f"Saved blended model to: {output_path}")
+            results[index] = blend_info
+        except Exception as error:
+            metrics.error(f"An error occurred saving '{output_path}': {error}")
+            results[index] = error
+
+    with ThreadPoolExecutor(max_workers=max_writers) as pool:
+        for i, (output_path, blend_rules, default_weight) in enumerate(variants):
+            variant_metrics = metrics.child(output_path=output_path, variant=i)
+            try:
+                metrics.log(f"Variant {i+1}/{len(variants)}: '{output_path}'", "debug")
+                with variant_metrics.span("rules", rules=len(blend_rules)):
+                    default_weights, rule_weights = resolve_blend_weights(blend_rules, default_weight, n_models, metrics)
+                    layer_weights = resolve_layer_rules(layer_keys, blend_rules).layer_weights(
+                        rule_weights, default_weights
+                    )
+
+                opt = OrderedDict()
+                with variant_metrics.span("blend") as record:
+                    opt["weight"] = {
+                        key: blend_layer(key, resident[key], layer_weights[key])
+                        for key in layer_keys
+                    }
+                    record["layers"] = len(layer_keys)
+                    record["bytes"] = weights_nbytes(opt["weight"])
+                opt.update(metadata)
+                blend_info = f"Blended {sources} with {len(blend_rules)} layer-specific rules"
+                opt["info"] = blend_info
+
+                while len(pending) >= max_writers:
+                    collect(*pending.popleft())
+                future = pool.submit(save_variant, variant_metrics, opt, output_path)
+                pending.append((i, output_path, blend_info, future))
+                del opt
+            except Exception as error:
+                metrics.error(f"An error occurred blending variant {i+1}: {error}")
+                results[i] = error
+        while pending:
+            collect(*pending.popleft())
+
+    return results
+
+
 # main test function
 if __name__ == "__main__":
     output_path = "../blends/model.pth"
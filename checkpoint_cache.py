@@ -0,0 +1,164 @@
+import os
+import threading
+import warnings
+import torch
+from collections import OrderedDict
+
+
+def _rebuild(obj, tensor_fn):
+    """Copy the containers of a checkpoint, passing every tensor through tensor_fn."""
+    if isinstance(obj, torch.Tensor):
+        return tensor_fn(obj)
+    if isinstance(obj, OrderedDict):
+        return OrderedDict((key, _rebuild(value, tensor_fn)) for key, value in obj.items())
+    if isinstance(obj, dict):
+        return {key: _rebuild(value, tensor_fn) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_rebuild(value, tensor_fn) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_rebuild(value, tensor_fn) for value in obj)
+    return obj
+
+
+def _view(obj):
+    """Copy the containers of a checkpoint, turning every tensor into a new view of the same storage."""
+    return _rebuild(obj, torch.Tensor.detach)
+
+
+def _copy(obj):
+    """Copy a checkpoint, cloning every tensor."""
+    return _rebuild(obj, torch.Tensor.clone)
+
+
+def _tensors(obj):
+    """Yield every tensor in a checkpoint."""
+    if isinstance(obj, torch.Tensor):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _tensors(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _tensors(value)
+
+
+def _versions(ckpt):
+    """Record the in-place modification counter of every tensor (shared with all its views)."""
+    return [(tensor, tensor._version) for tensor in _tensors(ckpt)]
+
+
+class CheckpointCache:
+    """
+    Process-wide LRU cache of loaded checkpoints.
+
+    Entries are keyed by absolute path, mtime, size and load mode, so a file that is rewritten
+    is loaded again, and memory-mapped and fully loaded copies are never handed out in place
+    of each other. Each entry is charged its file size against max_bytes; the least recently used
+    checkpoints are dropped when the budget is exceeded, and checkpoints larger than the whole
+    budget are not cached at all.
+
+    load() hands out a fresh dict per call (so callers may add, replace or delete keys), but the
+    tensors in it are views of the cached tensors: they share memory with every other caller.
+    They are read-only by contract: use out-of-place operations (a * b, t.float(), t.clone()),
+    never in-place ones (add_, mul_, copy_) on the tensors themselves. Torch has no read-only
+    tensors, so the cache checks each entry's modification counters on every hit instead: an
+    entry that was modified in place is dropped with a warning and loaded again from disk, so
+    the mistake cannot leak into later blends. Pass copy=True to get private clones instead.
+
+    Args:
+        max_bytes (int): Memory budget. 0 disables caching.
+    """
+
+    def __init__(self, max_bytes=4 * 1024**3):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (path, mtime_ns, size, mmap) -> (checkpoint, size, versions)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self, path, mmap=False, copy=False):
+        """
+        Load a .pth checkpoint onto the CPU, from the cache if it is unchanged since it was cached.
+
+        Args:
+            path (str): Path to the checkpoint
+            mmap (bool): Memory-map the file (see blender.load_checkpoint). Memory-mapped and
+                         full loads are cached separately.
+            copy (bool): Return clones the caller may modify in place, at the cost of a copy
+        Returns:
+            dict: The checkpoint, with read-only tensors shared with the cache (unless copy=True)
+        """
+        hand_out = _copy if copy else _view
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, bool(mmap))
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and any(tensor._version != version for tensor, version in entry[2]):
+                warnings.warn(f"A cached checkpoint was modified in place, loading it again: {path}. "
+                              "Tensors from the checkpoint cache must not be modified in place.",
+                              RuntimeWarning, stacklevel=3)
+                self.bytes -= self.entries.pop(key)[1]
+                entry = None
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return hand_out(entry[0])
+            self.misses += 1
+
+        ckpt = torch.load(path, map_location="cpu", weights_only=True, mmap=mmap)
+        if st.st_size <= self.max_bytes:
+            with self._lock:
+                # Drop older versions of the same file
+                for old_key in [k for k in self.entries if k[0] == key[0] and k[1:3] != key[1:3]]:
+                    self.bytes -= self.entries.pop(old_key)[1]
+                if key not in self.entries:
+                    self.entries[key] = (ckpt, st.st_size, _versions(ckpt))
+                    self.bytes += st.st_size
+                while self.bytes > self.max_bytes:
+                    _, (_, size, _) = self.entries.popitem(last=False)
+                    self.bytes -= size
+        return hand_out(ckpt)
+
+    def clear(self):
+        """Drop every cached checkpoint."""
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def info(self):
+        """Return {"entries", "bytes", "max_bytes", "hits", "misses"}."""
+        with self._lock:
+            return {"entries": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+_checkpoint_cache = CheckpointCache()
+
+
+def configure_checkpoint_cache(max_bytes):
+    """
+    Set the memory budget of the process-wide checkpoint cache, evicting entries if needed.
+
+    Args:
+        max_bytes (int): Memory budget. 0 disables caching.
+    Returns:
+        CheckpointCache: The cache
+    """
+    cache = _checkpoint_cache
+    with cache._lock:
+        cache.max_bytes = max_bytes
+        while cache.bytes > cache.max_bytes and cache.entries:
+            _, (_, size, _) = cache.entries.popitem(last=False)
+            cache.bytes -= size
+    return cache
+
+
+def get_checkpoint_cache():
+    """Return the process-wide checkpoint cache."""
+    return _checkpoint_cache
+
+
+def cached_load(path, mmap=False, copy=False):
+    """Load a checkpoint through the process-wide cache (see CheckpointCache.load)."""
+    return _checkpoint_cache.load(path, mmap=mmap, copy=copy)
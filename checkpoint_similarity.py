@@ -0,0 +1,266 @@
+import os
+import json
+import math
+import torch
+from blender import extract, load_checkpoint
+
+
+# Layer groups compared separately, see guide.md ("Main Components and Their Roles")
+COMPONENTS = ("enc_p", "flow", "dec", "emb_g")
+METRICS = ("cosine", "l2")
+
+
+def layer_component(key):
+    """Return the component a layer belongs to, or None for layers that are not compared (e.g. enc_q)."""
+    component = key.split(".", 1)[0]
+    return component if component in COMPONENTS else None
+
+
+def _pair_key(a, b):
+    return "\t".join(sorted((a, b)))
+
+
+class SimilarityMatrix:
+    """
+    Cached per-component distances between all checkpoints in a directory.
+
+    For every pair of models and every component (enc_p, flow, dec, emb_g) it stores the dot
+    product of the two models' weights and both squared norms, taken over the layers whose
+    shapes match. Cosine distance and L2 distance both follow from those three numbers. The
+    sums are kept in a JSON file, so refresh() after adding one checkpoint only compares it
+    with the N models already known (O(N) comparisons, not O(N^2)).
+
+    Layers are processed one at a time across all models: blocks of models are stacked into a
+    (models x elements) matrix per layer and compared in one matmul. Checkpoints are
+    memory-mapped, so memory holds a couple of stacked layers rather than whole models.
+
+    Args:
+        directory (str): The checkpoints directory (searched recursively)
+        cache_path (str): JSON file for the sums (default: directory/.similarity_matrix.json)
+        pattern (str): File ending of the checkpoints to compare, e.g. "_best.pth"
+
+    Example:
+        matrix = SimilarityMatrix("../models").refresh()
+        matrix.distance("../models/A.pth", "../models/B.pth", component="dec")
+        matrix.nearest("../models/A.pth", component="flow", k=3)
+    """
+
+    def __init__(self, directory, cache_path=None, pattern=".pth"):
+        self.directory = directory
+        self.cache_path = cache_path or os.path.join(directory, ".similarity_matrix.json")
+        self.pattern = pattern
+        self.models = {}  # path -> {"size", "mtime_ns"}
+        self.pairs = {}  # "path_a\tpath_b" -> {component: [dot, sq_a, sq_b, layers]}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+            self.models = cache.get("models", {})
+            self.pairs = cache.get("pairs", {})
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def _is_current(self, key):
+        entry = self.models.get(key)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(key)
+        except OSError:
+            return False
+        return entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+
+    def refresh(self, block_size=16):
+        """
+        Compare new or changed checkpoints with every model and forget deleted ones.
+
+        Args:
+            block_size (int): Models stacked into one matmul. Bounds memory to about
+                              2 * block_size copies of the largest layer in float32.
+        Returns:
+            SimilarityMatrix: self, for chaining
+        """
+        found = sorted(
+            self._key(os.path.join(folder, name))
+            for folder, _, names in os.walk(self.directory)
+            for name in names
+            if name.endswith(self.pattern)
+        )
+        stale = [key for key in found if not self._is_current(key)]
+        gone = [key for key in self.models if key not in found or key in stale]
+        for key in gone:
+            self.models.pop(key, None)
+        if gone:
+            gone_set = set(gone)
+            self.pairs = {
+                pair: sums for pair, sums in self.pairs.items()
+                if not gone_set.intersection(pair.split("\t"))
+            }
+        if stale:
+            unreadable = self._compare(stale, found, block_size)
+            for key in stale:
+                if key in unreadable:
+                    continue
+                st = os.stat(key)
+                self.models[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            # Known models that could not be read now were not compared with the new ones:
+            # forget them so the next refresh compares them again
+            for key in unreadable:
+                self.models.pop(key, None)
+        if stale or gone:
+            self.save()
+        print(f"Similarity matrix: {len(found)} models, {len(stale)} compared, "
+              f"{len([key for key in gone if key not in stale])} removed")
+        return self
+
+    def _compare(self, new, all_models, block_size):
+        """
+        Accumulate the dot products and squared norms of every (new, any) pair, layer by layer.
+
+        Returns:
+            set: The checkpoints that could not be read. They are left out of the matrix.
+        """
+        weights = {}
+        unreadable = set()
+        for key in all_models:
+            try:
+                ckpt = load_checkpoint(key, mmap=True, cache=False)
+                weights[key] = extract(ckpt)["weight"] if "model" in ckpt else ckpt["weight"]
+            except Exception as error:
+                print(f"Skipping {key}: {error}")
+                unreadable.add(key)
+        new = [key for key in new if key not in unreadable]
+        all_models = [key for key in all_models if key not in unreadable]
+        index = {key: i for i, key in enumerate(all_models)}
+        new_index = {key: i for i, key in enumerate(new)}
+        # sums[component][0/1/2/3] -> (new x all) tensors: dot, sq_new, sq_other, matched layers
+        sums = {component: torch.zeros(4, len(new), len(all_models), dtype=torch.float64) for component in COMPONENTS}
+
+        layer_keys = sorted({layer for key in new for layer in weights[key] if layer_component(layer)})
+        for layer in layer_keys:
+            sums_c = sums[layer_component(layer)]
+            # Models can only be compared on a layer when the shapes match
+            groups = {}
+            for key in all_models:
+                tensor = weights[key].get(layer)
+                if tensor is not None:
+                    groups.setdefault(tuple(tensor.shape), []).append(key)
+            for members in groups.values():
+                new_members = [key for key in members if key in new_index]
+                if not new_members:
+                    continue
+                for start in range(0, len(new_members), block_size):
+                    rows = new_members[start:start + block_size]
+                    a = torch.stack([weights[key][layer].reshape(-1).float() for key in rows])
+                    sq_a = (a * a).sum(dim=1).double()
+                    ri = torch.tensor([new_index[key] for key in rows])
+                    for other_start in range(0, len(members), block_size):
+                        cols = members[other_start:other_start + block_size]
+                        b = torch.stack([weights[key][layer].reshape(-1).float() for key in cols])
+                        sq_b = (b * b).sum(dim=1).double()
+                        ci = torch.tensor([index[key] for key in cols])
+                        grid = (ri[:, None], ci[None, :])
+                        sums_c[0].index_put_(grid, (a @ b.T).double(), accumulate=True)
+                        sums_c[1].index_put_(grid, sq_a[:, None].expand(len(rows), len(cols)), accumulate=True)
+                        sums_c[2].index_put_(grid, sq_b[None, :].expand(len(rows), len(cols)), accumulate=True)
+                        sums_c[3].index_put_(grid, torch.ones(len(rows), len(cols), dtype=torch.float64),
+                                             accumulate=True)
+                        del b
+                    del a
+
+        for i, a in enumerate(new):
+            for j, b in enumerate(all_models):
+                if a == b or (b in new_index and new_index[b] < i):
+                    continue  # self pairs and new-new pairs already stored from the other side
+                pair = _pair_key(a, b)
+                swap = pair.split("\t")[0] != a
+                entry = {}
+                for component in COMPONENTS:
+                    dot, sq_a, sq_b, layers = sums[component][:, i, j].tolist()
+                    entry[component] = [dot, sq_b, sq_a, int(layers)] if swap else [dot, sq_a, sq_b, int(layers)]
+                self.pairs[pair] = entry
+        return unreadable
+
+    def save(self):
+        """Write the sums to the JSON cache file."""
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "components": list(COMPONENTS), "models": self.models, "pairs": self.pairs}, f)
+        os.replace(temp_path, self.cache_path)
+
+    def distance(self, path_a, path_b, component="all", metric="cosine"):
+        """
+        Distance between two compared checkpoints.
+
+        Args:
+            path_a (str): First checkpoint
+            path_b (str): Second checkpoint
+            component (str): "enc_p", "flow", "dec", "emb_g" or "all" (every component together)
+            metric (str): "cosine" (1 - cosine similarity) or "l2" (Euclidean distance)
+        Returns:
+            float: The distance, or None if the models share no layers of that component or have
+                   not been compared with each other (refresh() compares them)
+        """
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, not {metric!r}")
+        a, b = self._key(path_a), self._key(path_b)
+        if a == b:
+            return 0.0
+        if a not in self.models or b not in self.models:
+            raise KeyError(f"{path_a if a not in self.models else path_b} has not been compared; call refresh()")
+        entry = self.pairs.get(_pair_key(a, b))
+        if entry is None:
+            return None
+        components = COMPONENTS if component == "all" else (component,)
+        dot = sq_a = sq_b = layers = 0
+        for name in components:
+            d, x, y, n = entry[name]
+            dot, sq_a, sq_b, layers = dot + d, sq_a + x, sq_b + y, layers + n
+        if layers == 0:
+            return None
+        if metric == "l2":
+            return math.sqrt(max(0.0, sq_a + sq_b - 2 * dot))
+        if sq_a == 0 or sq_b == 0:
+            return None
+        return 1.0 - dot / math.sqrt(sq_a * sq_b)
+
+    def matrix(self, component="all", metric="cosine"):
+        """
+        Full distance matrix.
+
+        Returns:
+            tuple: (paths, rows) where rows[i][j] is the distance between paths[i] and paths[j]
+        """
+        paths = sorted(self.models)
+        return paths, [[self.distance(a, b, component, metric) for b in paths] for a in paths]
+
+    def nearest(self, path, component="all", metric="cosine", k=5):
+        """
+        The k compared checkpoints closest to a checkpoint.
+
+        Returns:
+            list: [(path, distance), ...], closest first
+        """
+        key = self._key(path)
+        distances = [(other, self.distance(key, other, component, metric)) for other in self.models if other != key]
+        distances = [(other, d) for other, d in distances if d is not None]
+        return sorted(distances, key=lambda item: item[1])[:k]
+
+    def to_csv(self, output_path, component="all", metric="cosine"):
+        """Write the distance matrix as a CSV table, e.g. for a spreadsheet heat map."""
+        import csv
+        paths, rows = self.matrix(component, metric)
+        names = [os.path.relpath(path, self.directory) for path in paths]
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{component} {metric}"] + names)
+            for name, row in zip(names, rows):
+                writer.writerow([name] + ["" if d is None else f"{d:.6g}" for d in row])
+        return output_path
+
+
+if __name__ == "__main__":
+    matrix = SimilarityMatrix("../models").refresh()
+    for component in COMPONENTS:
+        matrix.to_csv(f"../models/similarity_{component}.csv", component=component)
@@ -1,4 +1,13 @@
+import os
+import csv
+import json
+import pickle
+import zipfile
 import torch
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from checkpoint_cache import cached_load
+
 
 def extract(ckpt):
     a = ckpt["model"]
@@ -11,16 +20,161 @@ def extract(ckpt):
     return opt
 
 
+# Element sizes of the storage classes torch.save writes, by class name
+_STORAGE_DTYPES = {
+    "HalfStorage": ("float16", 2),
+    "BFloat16Storage": ("bfloat16", 2),
+    "FloatStorage": ("float32", 4),
+    "DoubleStorage": ("float64", 8),
+    "CharStorage": ("int8", 1),
+    "ByteStorage": ("uint8", 1),
+    "ShortStorage": ("int16", 2),
+    "IntStorage": ("int32", 4),
+    "LongStorage": ("int64", 8),
+    "BoolStorage": ("bool", 1),
+}
+
+
+class TensorInfo:
+    """Shape and dtype of a tensor in a checkpoint, read without loading its data."""
+
+    def __init__(self, shape, dtype, itemsize):
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.numel = 1
+        for dim in self.shape:
+            self.numel *= dim
+        self.nbytes = self.numel * itemsize
+
+    def __repr__(self):
+        return f"TensorInfo(shape={list(self.shape)}, dtype={self.dtype})"
+
+
+def _rebuild_tensor_info(storage, storage_offset, size, stride, *args):
+    dtype, itemsize = storage
+    return TensorInfo(size, dtype, itemsize)
+
+
+def _rebuild_parameter(data, *args):
+    return data
+
+
+class _HeaderUnpickler(pickle.Unpickler):
+    """Unpickles a checkpoint's data.pkl, turning tensors into TensorInfo instead of loading storage."""
+
+    _ALLOWED = {
+        ("collections", "OrderedDict"): OrderedDict,
+        ("torch._utils", "_rebuild_tensor_v2"): _rebuild_tensor_info,
+        ("torch._utils", "_rebuild_parameter"): _rebuild_parameter,
+        ("builtins", "set"): set,
+        ("builtins", "frozenset"): frozenset,
+        ("builtins", "slice"): slice,
+    }
+
+    def find_class(self, module, name):
+        if (module, name) in self._ALLOWED:
+            return self._ALLOWED[(module, name)]
+        if module == "torch" and name in _STORAGE_DTYPES:
+            return name
+        if (module, name) == ("_codecs", "encode"):
+            import _codecs
+            return _codecs.encode
+        raise pickle.UnpicklingError(f"Unsupported global in checkpoint: {module}.{name}")
+
+    def persistent_load(self, pid):
+        # ("storage", storage type, key, location, numel)
+        return _STORAGE_DTYPES[pid[1]]
+
+
+def read_checkpoint_header(path):
+    """
+    Read a checkpoint's structure without loading any tensor data.
+
+    Only the pickled metadata inside the .pth zip archive is read, so this takes milliseconds
+    even for checkpoints of hundreds of MB. Tensors are returned as TensorInfo objects.
+
+    Args:
+        path (str): Path to a .pth file saved by torch.save (zip format)
+    Returns:
+        dict: The checkpoint with TensorInfo in place of tensors
+    Raises:
+        ValueError: If the file is not a zip-format checkpoint or uses unsupported types
+    """
+    if not zipfile.is_zipfile(path):
+        raise ValueError(f"{path} is not a zip-format torch checkpoint")
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name in archive.namelist() if name.endswith("data.pkl")]
+        if not names:
+            raise ValueError(f"{path} has no data.pkl record")
+        with archive.open(min(names, key=len)) as data:
+            try:
+                return _HeaderUnpickler(data).load()
+            except (pickle.UnpicklingError, KeyError) as error:
+                raise ValueError(f"Cannot read header of {path}: {error}") from error
+
+
+def inspect_checkpoint(path):
+    """
+    Summarize an RVC checkpoint from its header only (no tensor data is loaded).
+
+    Args:
+        path (str): Path to the .pth file
+    Returns:
+        dict: path, size, format ("model" for training checkpoints, "weight" for inference
+              weights, "int8" for compact files from quantized_format), sr, f0, version, vocoder, info, num_layers, num_params, tensor_bytes
+              and layers ({key: {"shape": [...], "dtype": "float16"}})
+    """
+    ckpt = read_checkpoint_header(path)
+    if "quantization" in ckpt and "weight_int8" in ckpt:
+        # Compact int8 file: the layers are split between weight_fp16 and weight_int8
+        checkpoint_format = "int8"
+        weights = {
+            key: ckpt["weight_int8"].get(key, ckpt["weight_fp16"].get(key))
+            for key in ckpt["quantization"]["order"]
+        }
+    else:
+        checkpoint_format = "model" if "model" in ckpt else "weight" if "weight" in ckpt else None
+        weights = ckpt.get(checkpoint_format, {}) if checkpoint_format else {}
+    layers = {
+        key: {"shape": list(value.shape), "dtype": value.dtype}
+        for key, value in weights.items()
+        if isinstance(value, TensorInfo)
+    }
+    tensors = [value for value in weights.values() if isinstance(value, TensorInfo)]
+    return {
+        "path": str(path),
+        "size": os.path.getsize(path),
+        "format": checkpoint_format,
+        "sr": ckpt.get("sr"),
+        "f0": ckpt.get("f0"),
+        "version": ckpt.get("version"),
+        "vocoder": ckpt.get("vocoder"),
+        "info": ckpt.get("info"),
+        "num_layers": len(layers),
+        "num_params": sum(t.numel for t in tensors),
+        "tensor_bytes": sum(t.nbytes for t in tensors),
+        "layers": layers,
+    }
+
+
 def recursive_key_print(indent_level, data):
     for key, value in data.items():
-        print("  " * indent_level + f"{key}: {value.shape if isinstance(value, torch.Tensor) else type(value)}")
+        print("  " * indent_level + f"{key}: {value.shape if isinstance(value, (torch.Tensor, TensorInfo)) else type(value)}")
         if isinstance(value, dict):
             recursive_key_print(indent_level + 1, value)
 
 
-def explore(path):
+def explore(path, lazy=True):
+    # Full loads come from the checkpoint cache; this only prints the structure
     try:
-        ckpt = torch.load(path, map_location="cpu", weights_only=True)
+        if lazy:
+            try:
+                ckpt = read_checkpoint_header(path)
+            except ValueError as error:
+                print(f"Header-only read failed ({error}), loading the full checkpoint")
+                ckpt = cached_load(path)
+        else:
+            ckpt = cached_load(path)
         recursive_key_print(0, ckpt)
 
 
@@ -29,6 +183,53 @@ def explore(path):
         return error
 
 
+_CSV_COLUMNS = ["path", "size", "format", "sr", "f0", "version", "vocoder", "info",
+                "num_layers", "num_params", "tensor_bytes", "error"]
+
+
+def explore_directory(directory, output_path=None, workers=8, pattern=".pth"):
+    """
+    Inspect every checkpoint in a directory tree in parallel, reading headers only.
+
+    Args:
+        directory (str): Folder to search (recursively)
+        output_path (str): Optional .json (full summaries including layers) or .csv
+                           (one row per file, without layers) to write the results to
+        workers (int): Number of files inspected at the same time
+        pattern (str): File ending of the checkpoints to inspect
+    Returns:
+        list: One inspect_checkpoint summary per file, sorted by path. Files that could not be
+              read have only "path" and "error".
+    """
+    paths = sorted(
+        os.path.join(folder, name)
+        for folder, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(pattern)
+    )
+
+    def inspect(path):
+        try:
+            return inspect_checkpoint(path)
+        except Exception as error:
+            return {"path": path, "error": str(error)}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(inspect, paths))
+
+    if output_path:
+        if output_path.lower().endswith(".csv"):
+            with open(output_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=_CSV_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(results)
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, default=str)
+        print(f"Wrote {len(results)} checkpoint summaries to {output_path}")
+    return results
+
+
 # Main func
 if __name__ == "__main__":
-    explore("../models/Dalitso.pth")
\ No newline at end of file
+    explore("../models/Dalitso.pth")
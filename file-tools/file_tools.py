@@ -1,5 +1,8 @@
+import os
 import re
 import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def regex_copy(source_pattern, target_pattern, dry_run=True, root=".", verbose=False):
@@ -41,6 +44,214 @@ def regex_copy(source_pattern, target_pattern, dry_run=True, root=".", verbose=F
                     print(f"  - No match for {path_str}")
 
 
+_REGEX_SPECIAL = set(".^$*+?{}[]()|\\")
+_FICLONE = 0x40049409  # Linux ioctl that clones a file's extents (reflink)
+
+def _has_top_level_alternation(pattern):
+    """True if pattern contains a '|' outside of any group or character class."""
+    depth, in_class, i = 0, False, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+def literal_directory_prefix(source_pattern):
+    """
+    Return the directory part of source_pattern that is plain text, e.g. "tests/English/" for
+    r"tests/English/(.*)\\.txt". Only directories on this path can contain matching files.
+    Returns "" if the pattern has no literal directory prefix.
+    """
+    if _has_top_level_alternation(source_pattern):
+        return ""
+    pattern = source_pattern[1:] if source_pattern.startswith("^") else source_pattern
+    literal, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                literal.append(pattern[i + 1])
+                i += 2
+                continue
+            break  # \d, \w, ... are not literal
+        if c in _REGEX_SPECIAL:
+            break
+        literal.append(c)
+        i += 1
+    # A quantifier makes the character before it optional or repeated
+    if i < len(pattern) and pattern[i] in "*+?{":
+        literal = literal[:-1]
+    literal = "".join(literal)
+    return literal[:literal.rfind("/") + 1]
+
+def _walk_files(root, prefix):
+    """Yield (path string with forward slashes, DirEntry) for files under root, pruned to prefix."""
+    root_str = str(Path(root)).replace('\\', '/')
+    stack = [(str(Path(root)), "" if root_str == "." else root_str)]
+    while stack:
+        directory, directory_str = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            path_str = f"{directory_str}/{entry.name}" if directory_str else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                dir_str = path_str + "/"
+                # Descend only into ancestors of the prefix directory and directories inside it
+                if not prefix or prefix.startswith(dir_str) or dir_str.startswith(prefix):
+                    stack.append((entry.path, path_str))
+            elif entry.is_file():
+                yield path_str, entry
+
+def _is_unchanged(source, source_stat, target, mode):
+    """True if target already holds source for the given mode."""
+    try:
+        target_stat = os.stat(target) if mode != "symlink" else os.lstat(target)
+    except OSError:
+        return False
+    if mode == "symlink":
+        return os.path.islink(target) and os.readlink(target) == os.path.abspath(source)
+    if mode == "hardlink":
+        return os.path.samestat(source_stat, target_stat)
+    return target_stat.st_size == source_stat.st_size and int(target_stat.st_mtime) == int(source_stat.st_mtime)
+
+def _reflink(source, target):
+    """Clone source to target without copying data. Falls back to a normal copy if unsupported."""
+    import fcntl
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        shutil.copystat(source, target)
+        return "Reflinked"
+    except OSError:
+        shutil.copy2(source, target)
+        return "Copied (reflink not supported)"
+
+def _transfer(source, target, mode):
+    """
+    Copy, link or clone source to target.
+
+    Links and clones are created under a temporary name next to the target and then renamed over
+    it, so an existing target is only replaced once the new one is complete. A target that
+    already is the source (same file, hardlink or symlink to it) is left alone: deleting it first
+    would delete the source.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return "Skipped (target is the source)"
+    if mode == "copy":
+        shutil.copy2(source, target)
+        return "Copied"
+    temp_target = target.parent / f".{target.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        if mode == "hardlink":
+            os.link(source, temp_target)
+            action = "Hardlinked"
+        elif mode == "symlink":
+            os.symlink(os.path.abspath(source), temp_target)
+            action = "Symlinked"
+        else:
+            action = _reflink(source, temp_target)
+        os.replace(temp_target, target)
+    finally:
+        if os.path.lexists(temp_target):
+            os.remove(temp_target)
+    return action
+
+def fast_regex_copy(source_pattern, target_pattern, dry_run=True, root=".", mode="copy", workers=8,
+                    skip_unchanged=True, verbose=False):
+    """
+    Faster regex_copy for large trees, with link modes, unchanged-file skipping and collision checks.
+
+    Only the directories on the literal start of source_pattern are walked (e.g. "tests/English/"
+    for r"tests/English/(.*)"), files are transferred on a thread pool, and targets that already
+    hold the same file are skipped.
+
+    Args:
+        source_pattern (str): regex to match source file paths.
+        target_pattern (str): target path pattern, can use \\1, \\2, ... from source_pattern.
+        dry_run (bool): if True, only print the actions, the planned bytes and any target collisions.
+        root (str or Path): directory to start searching from, as in regex_copy.
+        mode (str): "copy", "hardlink", "symlink" or "reflink". Links gather e.g. _best.pth files
+                    without duplicating gigabytes; reflink falls back to copying where the file
+                    system cannot clone files.
+        workers (int): number of threads transferring files.
+        skip_unchanged (bool): if True, skip targets with the same size and mtime as the source
+                               (for links: already pointing at the source).
+        verbose (bool): if True, print every path tested.
+
+    Returns:
+        dict: {"planned": [(source, target), ...], "bytes": planned bytes, "skipped": unchanged count,
+               "collisions": {target: [sources]}}
+    """
+    if mode not in ("copy", "hardlink", "symlink", "reflink"):
+        raise ValueError(f"mode must be copy, hardlink, symlink or reflink, not {mode!r}")
+    regex = re.compile(source_pattern.replace('/', r'[/\\]'))
+    prefix = literal_directory_prefix(source_pattern)
+
+    if dry_run:
+        print(f"{'-'*20}\nWARNING: This is a dry run. No files will be copied. To copy files, set dry_run=False\n{'-'*20}")
+
+    # Plan every transfer first so colliding targets are found before anything is written
+    targets = {}
+    for path_str, entry in _walk_files(root, prefix):
+        if verbose:
+            print(f"Testing path: {path_str}")
+        match = regex.match(path_str)
+        if match:
+            targets.setdefault(Path(match.expand(target_pattern)), []).append((entry.path, entry.stat()))
+        elif verbose:
+            print(f"  - No match for {path_str}")
+
+    collisions = {str(t): [s for s, _ in sources] for t, sources in targets.items() if len(sources) > 1}
+    for target, sources in collisions.items():
+        print(f"  ! Collision: {len(sources)} files map to {target}, skipping them: {sources}")
+
+    planned, skipped, planned_bytes = [], 0, 0
+    for target, sources in targets.items():
+        if len(sources) > 1:
+            continue
+        source, source_stat = sources[0]
+        if skip_unchanged and _is_unchanged(source, source_stat, target, mode):
+            skipped += 1
+            if verbose:
+                print(f"  - Unchanged {source} → {target}")
+            continue
+        planned.append((source, target))
+        planned_bytes += source_stat.st_size
+
+    if dry_run:
+        for source, target in planned:
+            print(f"  - Would {mode} {source} → {target}")
+    else:
+        def run(job):
+            source, target = job
+            action = _transfer(source, target, mode)
+            print(f"  - {action} {source} → {target}")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, planned))
+
+    done = {"copy": "copied", "hardlink": "hardlinked", "symlink": "symlinked", "reflink": "reflinked"}[mode]
+    print(f"{len(planned)} files ({planned_bytes / 1e6:.1f} MB) {'to ' + mode if dry_run else done}, "
+          f"{skipped} unchanged, {len(collisions)} colliding targets")
+    return {"planned": [(s, str(t)) for s, t in planned], "bytes": planned_bytes,
+            "skipped": skipped, "collisions": collisions}
+
+
 # Example usage:
 # copy(r"data/raw/(.*)\.txt", r"data/processed/\1.csv")
 
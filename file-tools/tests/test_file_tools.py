@@ -0,0 +1,96 @@
+import os
+import pytest
+
+from file_tools import fast_regex_copy, literal_directory_prefix
+
+SOURCE = r"models/(.*)_best\.pth"
+TARGET = r"best/\1.pth"
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("models")
+    for name, content in [("Tom_best.pth", b"tom"), ("Jane_best.pth", b"jane"), ("Tom_e5.pth", b"e5")]:
+        with open(os.path.join("models", name), "wb") as f:
+            f.write(content)
+    return tmp_path
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_literal_directory_prefix():
+    assert literal_directory_prefix(r"tests/English/(.*)\.txt") == "tests/English/"
+    assert literal_directory_prefix(r"tests/Eng?lish/(.*)") == "tests/"
+    assert literal_directory_prefix(r"a/(.*)|b/(.*)") == ""
+
+
+def test_dry_run_writes_nothing(tree):
+    report = fast_regex_copy(SOURCE, TARGET, dry_run=True)
+    assert sorted(target for _, target in report["planned"]) == ["best/Jane.pth", "best/Tom.pth"]
+    assert report["bytes"] == len(b"tom") + len(b"jane")
+    assert not os.path.exists("best")
+
+
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink", "reflink"])
+def test_modes_transfer_matching_files(tree, mode):
+    fast_regex_copy(SOURCE, TARGET, dry_run=False, mode=mode)
+    assert read("best/Tom.pth") == b"tom"
+    assert read("best/Jane.pth") == b"jane"
+    assert not os.path.exists("best/Tom_e5.pth")
+    if mode == "hardlink":
+        assert os.path.samefile("best/Tom.pth", "models/Tom_best.pth")
+    if mode == "symlink":
+        assert os.readlink("best/Tom.pth") == os.path.abspath("models/Tom_best.pth")
+    else:
+        assert not os.path.islink("best/Tom.pth")
+
+
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink", "reflink"])
+def test_second_run_skips_unchanged_targets(tree, mode):
+    fast_regex_copy(SOURCE, TARGET, dry_run=False, mode=mode)
+    report = fast_regex_copy(SOURCE, TARGET, dry_run=False, mode=mode)
+    assert report["planned"] == []
+    assert report["skipped"] == 2
+
+
+@pytest.mark.parametrize("mode", ["hardlink", "symlink", "reflink"])
+def test_links_replace_an_existing_target(tree, mode):
+    os.makedirs("best")
+    with open("best/Tom.pth", "wb") as f:
+        f.write(b"older")
+    fast_regex_copy(SOURCE, TARGET, dry_run=False, mode=mode)
+    assert read("best/Tom.pth") == b"tom"
+    assert [name for name in os.listdir("best") if name.endswith(".tmp")] == []
+
+
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink", "reflink"])
+def test_target_that_is_the_source_is_kept(tree, mode):
+    # Mapping every file onto itself must not delete the sources
+    report = fast_regex_copy(r"models/(.*)", r"models/\1", dry_run=False, mode=mode, skip_unchanged=False)
+    assert len(report["planned"]) == 3
+    assert read("models/Tom_best.pth") == b"tom"
+    assert not os.path.islink("models/Tom_best.pth")
+
+
+def test_hardlink_over_a_symlink_to_the_source_keeps_the_source(tree):
+    fast_regex_copy(SOURCE, TARGET, dry_run=False, mode="symlink")
+    fast_regex_copy(SOURCE, TARGET, dry_run=False, mode="hardlink")
+    assert read("models/Tom_best.pth") == b"tom"
+    assert read("best/Tom.pth") == b"tom"
+
+
+def test_colliding_targets_are_skipped(tree):
+    report = fast_regex_copy(r"models/(Tom)_.*\.pth", r"best/\1.pth", dry_run=False)
+    sources = report["collisions"]["best/Tom.pth"]
+    assert sorted(os.path.basename(source) for source in sources) == ["Tom_best.pth", "Tom_e5.pth"]
+    assert report["planned"] == []
+    assert not os.path.exists("best/Tom.pth")
+
+
+def test_unknown_mode_is_rejected(tree):
+    with pytest.raises(ValueError):
+        fast_regex_copy(SOURCE, TARGET, mode="move")
@@ -0,0 +1,220 @@
+import os
+import torch
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from blender import checkpoint_metadata, load_blend_parents, resolve_blend_weights, resolve_layer_rules, save_blend
+
+
+OUTPUT_DTYPES = {"fp16": torch.float16, "bf16": torch.bfloat16, "fp32": torch.float32}
+
+
+class FlatLayout:
+    """
+    Offset table of the layers packed into flat buffers.
+
+    Layers are grouped by their dtypes in the models (e.g. fp16 in every model, or fp32 in model1
+    and fp16 in model2), and each model gets one flat buffer per group in its own dtypes, so no
+    layer is cast when it is packed. The groups are laid out back to back in the output buffer.
+    Shapes come from the first model, except that emb_g.weight keeps only the rows all models
+    share (the same truncation blend_models applies).
+
+    Args:
+        weights (list): The weight dicts of the models
+    """
+
+    def __init__(self, weights):
+        self.keys = list(weights[0].keys())
+        groups = OrderedDict()
+        for key in self.keys:
+            groups.setdefault(tuple(model_weights[key].dtype for model_weights in weights), []).append(key)
+
+        self.layers = []  # (key, shape, offset, numel) in packed order
+        self.groups = []  # (start, end) of each group in the packed order
+        self._group_layers = []  # (first, last + 1) index into self.layers of each group
+        offset = 0
+        for keys in groups.values():
+            start = offset
+            self._group_layers.append((len(self.layers), len(self.layers) + len(keys)))
+            for key in keys:
+                shape = list(weights[0][key].shape)
+                if key == "emb_g.weight":
+                    shape[0] = min(model_weights[key].shape[0] for model_weights in weights)
+                numel = 1
+                for dim in shape:
+                    numel *= dim
+                self.layers.append((key, torch.Size(shape), offset, numel))
+                offset += numel
+            self.groups.append((start, offset))
+        self.total = offset
+        self._starts = torch.tensor([layer_offset for _, _, layer_offset, _ in self.layers])
+        self._ends = torch.tensor([layer_offset + numel for _, _, layer_offset, numel in self.layers])
+
+    def pack(self, model_weights):
+        """Copy one model's layers into one contiguous buffer per group, each in the layers' own dtype."""
+        buffers = []
+        for (start, end), (first, last) in zip(self.groups, self._group_layers):
+            buffer = torch.empty(end - start, dtype=model_weights[self.layers[first][0]].dtype)
+            for key, shape, offset, numel in self.layers[first:last]:
+                tensor = model_weights[key][: shape[0]] if key == "emb_g.weight" else model_weights[key]
+                buffer[offset - start:offset - start + numel].copy_(tensor.reshape(-1))
+            buffers.append(buffer)
+        return buffers
+
+    def expand(self, layer_values, start, end):
+        """
+        Per-element values for the packed elements start:end, from one value per layer.
+
+        Args:
+            layer_values (Tensor): float32, one value per layer in packed order
+        Returns:
+            float or Tensor: A plain float if the range lies within one layer, else a float32 vector
+        """
+        first = int(torch.searchsorted(self._ends, start, right=True))
+        last = int(torch.searchsorted(self._starts, end))  # exclusive
+        if last - first == 1:
+            return float(layer_values[first])
+        counts = self._ends[first:last].clamp(max=end) - self._starts[first:last].clamp(min=start)
+        return torch.repeat_interleave(layer_values[first:last], counts)
+
+    def unpack(self, buffer):
+        """Split a flat buffer back into {key: tensor} views (no copies), in the models' key order."""
+        views = {key: buffer[offset:offset + numel].view(shape) for key, shape, offset, numel in self.layers}
+        return {key: views[key] for key in self.keys}
+
+
+class FlatBlendEngine:
+    """
+    Blend engine that works on whole models packed into flat buffers.
+
+    Each parent's weights are packed once into contiguous buffers (one per dtype group, see
+    FlatLayout). A blend computes the whole model as one fused lerp (or weighted sum for more
+    than two models), split into chunks that run on a thread pool. The per-layer weights are
+    kept as one scalar per layer and expanded only for the chunk being blended. Output chunks
+    are written straight into the result buffer; with fp32 output the lerp writes into it in place.
+
+    Args:
+        models (list): [{"path": "path/to/model1", "sid": 0}, {"path": "path/to/model2", "sid": 0}, ...]
+        workers (int): Threads blending chunks (default: CPU count)
+        chunk_size (int): Elements per chunk
+    """
+
+    def __init__(self, models, workers=None, chunk_size=1 << 20):
+        self.models = models
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        ckpts, weights, error_message = load_blend_parents(models, mmap=True)
+        if error_message:
+            raise ValueError(error_message)
+        self.metadata = checkpoint_metadata(ckpts[0])
+        self.layout = FlatLayout(weights)
+        self.buffers = [self.layout.pack(model_weights) for model_weights in weights]
+
+    def layer_alphas(self, blend_rules, default_weight=0.5):
+        """
+        Resolve the blend rules into one weight per layer and model.
+
+        Args:
+            blend_rules (list): Rules as for blend_models ("weight") or blend_n_models ("weights")
+            default_weight (float or list): model1's weight for two models, or one weight per model
+        Returns:
+            list: One float32 tensor per model, with one weight per layer in packed order
+        """
+        n_models = len(self.buffers)
+        default_weights, rule_weights = resolve_blend_weights(blend_rules, default_weight, n_models)
+        layer_weights = resolve_layer_rules(self.layout.keys, blend_rules).layer_weights(rule_weights, default_weights)
+        return [
+            torch.tensor([layer_weights[key][i] for key, _, _, _ in self.layout.layers], dtype=torch.float32)
+            for i in range(n_models)
+        ]
+
+    def blend(self, blend_rules, default_weight=0.5, output_dtype="fp16"):
+        """
+        Blend the parents.
+
+        Args:
+            blend_rules (list): Rules as for blend_models or blend_n_models
+            default_weight (float or list): Weight for layers not matched by any rule
+            output_dtype (str): "fp16" (what blend_models writes), "bf16" or "fp32"
+        Returns:
+            dict: {key: tensor}. The tensors are views into one flat output buffer.
+        """
+        alphas = self.layer_alphas(blend_rules, default_weight)
+        out = torch.empty(self.layout.total, dtype=OUTPUT_DTYPES[output_dtype])
+
+        def blend_chunk(job):
+            group, start, end = job
+            group_start = self.layout.groups[group][0]
+            chunks = [buffers[group][start - group_start:end - group_start].float() for buffers in self.buffers]
+            if len(chunks) == 2:
+                # alpha * a + (1 - alpha) * b, written straight into the output when it is fp32
+                alpha = self.layout.expand(alphas[0], start, end)
+                if out.dtype == torch.float32:
+                    torch.lerp(chunks[1], chunks[0], alpha, out=out[start:end])
+                else:
+                    out[start:end] = torch.lerp(chunks[1], chunks[0], alpha)
+            else:
+                acc = chunks[0] * self.layout.expand(alphas[0], start, end)
+                for chunk, model_alphas in zip(chunks[1:], alphas[1:]):
+                    alpha = self.layout.expand(model_alphas, start, end)
+                    if isinstance(alpha, float):
+                        acc.add_(chunk, alpha=alpha)
+                    else:
+                        acc.addcmul_(chunk, alpha)
+                out[start:end] = acc
+
+        # Chunks never cross a group boundary, so each one reads a single buffer per model
+        jobs = [
+            (group, start, min(start + self.chunk_size, group_end))
+            for group, (group_start, group_end) in enumerate(self.layout.groups)
+            for start in range(group_start, group_end, self.chunk_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(blend_chunk, jobs))
+        return self.layout.unpack(out)
+
+    def blend_to_file(self, output_path, blend_rules, default_weight=0.5, output_dtype="fp16", output_format="pth"):
+        """
+        Blend the parents and save the result with the first model's metadata.
+
+        Args:
+            output_path (str): Output path
+            blend_rules (list): Rules as for blend_models or blend_n_models
+            default_weight (float or list): Weight for layers not matched by any rule
+            output_dtype (str): "fp16", "bf16" or "fp32"
+            output_format (str): "pth", "safetensors" or "int8" (see save_blend)
+        Returns:
+            str: The blend info message
+        """
+        opt = OrderedDict()
+        opt["weight"] = self.blend(blend_rules, default_weight, output_dtype)
+        opt.update(self.metadata)
+        sources = ", ".join(f"{m['path']} (sid:{m['sid']})" for m in self.models)
+        opt["info"] = f"Blended {sources} with {len(blend_rules)} layer-specific rules"
+        save_blend(opt, output_path, output_format)
+        print(f"Saved blended model to: {output_path}")
+        return opt["info"]
+
+
+def flat_blend_models(output_path, model1, model2, blend_rules, default_weight=0.5, output_dtype="fp16",
+                      workers=None, output_format="pth"):
+    """
+    blend_models using the flat-buffer engine.
+
+    Args:
+        output_path (str): Relative path including name for the output blended model
+        model1 (dict): {"path": "path/to/model1", "sid": 0}
+        model2 (dict): {"path": "path/to/model2", "sid": 0}
+        blend_rules (list): [{"layers": "pattern", "weight": 0.3}, ...] as for blend_models
+        default_weight (float): Default weight of model1 for layers not specified in blend_rules
+        output_dtype (str): "fp16", "bf16" or "fp32"
+        workers (int): Threads blending chunks (default: CPU count)
+        output_format (str): "pth", "safetensors" or "int8" (see save_blend)
+    Returns:
+        str: message on success, error on failure
+    """
+    try:
+        engine = FlatBlendEngine([model1, model2], workers=workers)
+        return engine.blend_to_file(output_path, blend_rules, default_weight, output_dtype, output_format)
+    except Exception as error:
+        print(f"An error occurred blending the models: {error}")
+        return error
@@ -1,6 +1,9 @@
 import os
 import torch
 from collections import OrderedDict
+from blend_metrics import get_metrics
+from checkpoint_cache import cached_load
+from quantized_format import dequantize_checkpoint
 
 
 def extract(ckpt):
@@ -14,11 +17,26 @@ def extract(ckpt):
     return opt
 
 
-def model_blender(name, path1, path2, ratio):
+# File name ending for each output_format
+OUTPUT_SUFFIXES = {"pth": ".pth", "safetensors": ".safetensors", "int8": ".int8.pth"}
+
+
+def model_blender(name, path1, path2, ratio, catalog=None, output_format="pth", metrics=None):
+    if output_format not in OUTPUT_SUFFIXES:
+        raise ValueError(f"output_format must be 'pth', 'safetensors' or 'int8', not {output_format!r}")
+    metrics = get_metrics(metrics, operation="model_blender", name=name)
     try:
         message = f"Model {path1} and {path2} are merged with alpha {ratio}."
-        ckpt1 = torch.load(path1, map_location="cpu", weights_only=True)
-        ckpt2 = torch.load(path2, map_location="cpu", weights_only=True)
+        if catalog is not None:
+            with metrics.span("validate", stage="catalog"):
+                reason = catalog.check_compatible(path1, path2)
+            if reason:
+                return reason
+        with metrics.span("load") as record:
+            # Shared with the checkpoint cache: the tensors are only read below
+            ckpt1 = dequantize_checkpoint(cached_load(path1))
+            ckpt2 = dequantize_checkpoint(cached_load(path2))
+            record["bytes"] = os.path.getsize(path1) + os.path.getsize(path2)
 
         if ckpt1["sr"] != ckpt2["sr"]:
             return "The sample rates of the two models are not the same."
@@ -29,31 +47,35 @@ def model_blender(name, path1, path2, ratio):
         cfg_sr = ckpt1["sr"]
         vocoder = ckpt1.get("vocoder", "HiFi-GAN")
 
-        if "model" in ckpt1:
-            ckpt1 = extract(ckpt1)
-        else:
-            ckpt1 = ckpt1["weight"]
-        if "model" in ckpt2:
-            ckpt2 = extract(ckpt2)
-        else:
-            ckpt2 = ckpt2["weight"]
+        with metrics.span("extract"):
+            if "model" in ckpt1:
+                ckpt1 = extract(ckpt1)
+            else:
+                ckpt1 = ckpt1["weight"]
+            if "model" in ckpt2:
+                ckpt2 = extract(ckpt2)
+            else:
+                ckpt2 = ckpt2["weight"]
 
         if sorted(list(ckpt1.keys())) != sorted(list(ckpt2.keys())):
             return "Fail to merge the models. The model architectures are not the same."
 
         opt = OrderedDict()
         opt["weight"] = {}
-        for key in ckpt1.keys():
-            if key == "emb_g.weight" and ckpt1[key].shape != ckpt2[key].shape:
-                min_shape0 = min(ckpt1[key].shape[0], ckpt2[key].shape[0])
-                opt["weight"][key] = (
-                    ratio * (ckpt1[key][:min_shape0].float())
-                    + (1 - ratio) * (ckpt2[key][:min_shape0].float())
-                ).half()
-            else:
-                opt["weight"][key] = (
-                    ratio * (ckpt1[key].float()) + (1 - ratio) * (ckpt2[key].float())
-                ).half()
+        with metrics.span("blend") as record:
+            for key in ckpt1.keys():
+                if key == "emb_g.weight" and ckpt1[key].shape != ckpt2[key].shape:
+                    min_shape0 = min(ckpt1[key].shape[0], ckpt2[key].shape[0])
+                    opt["weight"][key] = (
+                        ratio * (ckpt1[key][:min_shape0].float())
+                        + (1 - ratio) * (ckpt2[key][:min_shape0].float())
+                    ).half()
+                else:
+                    opt["weight"][key] = (
+                        ratio * (ckpt1[key].float()) + (1 - ratio) * (ckpt2[key].float())
+                    ).half()
+            record["layers"] = len(opt["weight"])
+            record["bytes"] = sum(t.numel() * t.element_size() for t in opt["weight"].values())
 
         opt["config"] = cfg
         opt["sr"] = cfg_sr
@@ -62,9 +84,19 @@ def model_blender(name, path1, path2, ratio):
         opt["info"] = message
         opt["vocoder"] = vocoder
 
-        torch.save(opt, os.path.join("logs", f"{name}.pth"))
-        print(message)
-        return message, os.path.join("logs", f"{name}.pth")
+        output_path = os.path.join("logs", f"{name}{OUTPUT_SUFFIXES[output_format]}")
+        with metrics.span("save", format=output_format) as record:
+            if output_format == "safetensors":
+                from safetensors_format import save_safetensors
+                save_safetensors(opt, output_path)
+            elif output_format == "int8":
+                from quantized_format import save_quantized
+                save_quantized(opt, output_path)
+            else:
+                torch.save(opt, output_path)
+            record["bytes"] = os.path.getsize(output_path)
+        metrics.log(message)
+        return message, output_path
     except Exception as error:
-        print(f"An error occurred blending the models: {error}")
+        metrics.error(f"An error occurred blending the models: {error}")
         return error
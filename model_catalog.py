@@ -0,0 +1,199 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from explore_model import inspect_checkpoint
+
+
+def architecture_signature(layers):
+    """
+    Hash of the layer names and shapes that must match for two models to be blended.
+
+    enc_q layers are left out (extract drops them) and so is the speaker count of emb_g.weight,
+    because the blenders truncate it to the rows both models share.
+
+    Args:
+        layers (dict): {key: {"shape": [...], ...}} as returned by inspect_checkpoint
+    Returns:
+        str: The signature
+    """
+    items = []
+    for key in sorted(layers):
+        if "enc_q" in key:
+            continue
+        shape = list(layers[key]["shape"])
+        if key == "emb_g.weight":
+            shape = shape[1:]
+        items.append(f"{key}:{shape}")
+    return hashlib.sha1("\n".join(items).encode("utf-8")).hexdigest()
+
+
+def _scan(path):
+    """Build the catalog entry of one checkpoint from its header."""
+    st = os.stat(path)
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    try:
+        summary = inspect_checkpoint(path)
+    except Exception as error:
+        entry["error"] = str(error)
+        return entry
+    for field in ("format", "sr", "f0", "version", "vocoder", "num_layers", "num_params"):
+        entry[field] = summary[field]
+    entry["signature"] = architecture_signature(summary["layers"])
+    return entry
+
+
+class ModelCatalog:
+    """
+    Cached index of the models in a directory, for checking blend compatibility without loading them.
+
+    Per file it stores size, mtime, sample rate, version, f0 flag, vocoder, checkpoint format
+    ("model" for training checkpoints, "weight" for inference weights) and an architecture
+    signature. Entries are read from checkpoint headers only and kept in a JSON file, so
+    refreshing after a few new checkpoints only reads the new or changed files.
+
+    Args:
+        directory (str): The models directory to index (searched recursively)
+        cache_path (str): JSON file to keep the catalog in (default: directory/.model_catalog.json)
+        pattern (str): File ending of the checkpoints to index
+
+    Example:
+        catalog = ModelCatalog("../models").refresh()
+        catalog.compatible_partners("../models/Dalitso.pth")
+        blend_models(output_path, model1, model2, blend_rules, catalog=catalog)
+    """
+
+    def __init__(self, directory, cache_path=None, pattern=".pth"):
+        self.directory = directory
+        self.cache_path = cache_path or os.path.join(directory, ".model_catalog.json")
+        self.pattern = pattern
+        self.entries = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def _is_current(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(key)
+        except OSError:
+            return False
+        return entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+
+    def refresh(self, workers=8):
+        """
+        Bring the catalog up to date: scan new or changed files and forget deleted ones.
+
+        Args:
+            workers (int): Number of files scanned at the same time
+        Returns:
+            ModelCatalog: self, for chaining
+        """
+        found = {
+            self._key(os.path.join(folder, name))
+            for folder, _, names in os.walk(self.directory)
+            for name in names
+            if name.endswith(self.pattern)
+        }
+        stale = sorted(key for key in found if not self._is_current(key))
+        removed = [key for key in self.entries if key not in found and not os.path.exists(key)]
+        for key in removed:
+            del self.entries[key]
+        if stale:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for key, entry in zip(stale, pool.map(_scan, stale)):
+                    self.entries[key] = entry
+        if stale or removed:
+            self.save()
+        print(f"Model catalog: {len(found)} models, {len(stale)} scanned, {len(removed)} removed")
+        return self
+
+    def save(self):
+        """Write the catalog to its JSON file."""
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, indent=1)
+        os.replace(temp_path, self.cache_path)
+
+    def get(self, path):
+        """
+        Return the catalog entry of a model, scanning it first if it is new or has changed.
+
+        Args:
+            path (str): Path to the checkpoint (inside or outside the catalog directory)
+        Returns:
+            dict: The entry
+        """
+        key = self._key(path)
+        if not os.path.isfile(key):
+            return {"error": "file not found"}
+        if not self._is_current(key):
+            self.entries[key] = _scan(key)
+            self.save()
+        return self.entries[key]
+
+    def check_compatible(self, *paths):
+        """
+        Check that models can be blended together.
+
+        Args:
+            *paths (str): Two or more checkpoint paths
+        Returns:
+            str: The reason the models cannot be blended, or None if they can
+        """
+        first = self.get(paths[0])
+        for path in paths:
+            entry = self.get(path)
+            if "error" in entry:
+                return f"Cannot read {path}: {entry['error']}"
+        for path in paths[1:]:
+            entry = self.get(path)
+            if entry["sr"] != first["sr"]:
+                return f"The sample rates of {paths[0]} ({first['sr']}) and {path} ({entry['sr']}) are not the same."
+            if entry["signature"] != first["signature"]:
+                return f"The model architectures of {paths[0]} and {path} are not the same."
+        return None
+
+    def compatible_partners(self, path):
+        """
+        List the catalogued models that can be blended with a model.
+
+        Args:
+            path (str): Path to the checkpoint
+        Returns:
+            list: Paths of the compatible models, sorted
+        """
+        key = self._key(path)
+        entry = self.get(path)
+        if "error" in entry:
+            return []
+        return sorted(
+            other for other, other_entry in self.entries.items()
+            if other != key
+            and "error" not in other_entry
+            and other_entry["sr"] == entry["sr"]
+            and other_entry["signature"] == entry["signature"]
+        )
+
+    def compatible_jobs(self, arg_dicts, path_columns):
+        """
+        Filter batch jobs down to those whose models can be blended, reporting the others.
+
+        Args:
+            arg_dicts (iterable): Job parameter dictionaries, e.g. rows of a blending spreadsheet
+            path_columns (list): Parameter names holding the model paths, e.g. ["pth_path_1", "pth_path_2"]
+        Returns:
+            generator: The compatible jobs, in order
+        """
+        for index, arg_dict in enumerate(arg_dicts):
+            reason = self.check_compatible(*(arg_dict[column] for column in path_columns))
+            if reason:
+                print(f"Skipping job {index}: {reason}")
+                continue
+            yield arg_dict
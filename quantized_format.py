@@ -0,0 +1,182 @@
+import math
+import torch
+from collections import OrderedDict
+from checkpoint_cache import cached_load
+
+
+QUANTIZATION_VERSION = 1
+
+# Tensors smaller than this stay fp16; quantizing them saves almost nothing
+MIN_QUANTIZED_NUMEL = 4096
+
+
+def keep_fp16(key, tensor):
+    """
+    True for tensors that are stored as fp16 rather than int8.
+
+    These are the speaker embedding, biases, norm parameters (including the weight-norm
+    magnitudes weight_g), 1-D tensors and small tensors: they are sensitive to rounding
+    and account for a tiny fraction of the model size.
+    """
+    name = key.rsplit(".", 1)[-1]
+    return (
+        key.startswith("emb_g")
+        or name in ("bias", "gamma", "beta", "weight_g")
+        or "norm" in key
+        or tensor.dim() < 2
+        or tensor.numel() < MIN_QUANTIZED_NUMEL
+        or not tensor.is_floating_point()
+    )
+
+
+def quantize_tensor(tensor):
+    """
+    Symmetric int8 quantization with one scale per output channel (dim 0).
+
+    Returns:
+        tuple: (int8 tensor of the same shape, fp32 scales shaped to broadcast against it)
+    """
+    values = tensor.float()
+    scales = values.abs().amax(dim=tuple(range(1, values.dim())), keepdim=True) / 127.0
+    scales = scales.clamp(min=1e-12)
+    quantized = torch.round(values / scales).clamp_(-127, 127).to(torch.int8)
+    return quantized, scales
+
+
+def dequantize_tensor(quantized, scales):
+    """Inverse of quantize_tensor, returned as fp16."""
+    return (quantized.float() * scales).half()
+
+
+def quantize_checkpoint(checkpoint):
+    """
+    Turn an RVC inference checkpoint into its compact int8 form.
+
+    Args:
+        checkpoint (dict): {"weight": {key: tensor}, "config": ..., "sr": ..., ...}
+    Returns:
+        OrderedDict: {"weight_fp16": tensors kept as fp16, "weight_int8": int8 tensors,
+                     "weight_scales": per-channel scales, "quantization": {...}, then the metadata}.
+                     There is deliberately no "weight" key, so a reader that does not dequantize
+                     fails loudly instead of seeing a model with most layers missing.
+    """
+    opt = OrderedDict()
+    opt["weight_fp16"] = {}
+    opt["weight_int8"] = {}
+    opt["weight_scales"] = {}
+    order = []
+    for key, tensor in checkpoint["weight"].items():
+        order.append(key)
+        if keep_fp16(key, tensor):
+            opt["weight_fp16"][key] = tensor.half() if tensor.is_floating_point() else tensor
+        else:
+            opt["weight_int8"][key], opt["weight_scales"][key] = quantize_tensor(tensor)
+    opt["quantization"] = {"format": "int8-per-channel", "version": QUANTIZATION_VERSION, "order": order}
+    for key, value in checkpoint.items():
+        if key != "weight":
+            opt[key] = value
+    return opt
+
+
+def is_quantized(checkpoint):
+    """True for checkpoints written by save_quantized."""
+    return "quantization" in checkpoint and "weight_int8" in checkpoint
+
+
+def dequantize_checkpoint(checkpoint):
+    """
+    Turn a compact checkpoint back into a standard RVC checkpoint with an fp16 "weight" dict.
+
+    Layers are restored in their original order, so the result can be saved with torch.save
+    or passed to any tool that expects an RVC .pth. Checkpoints that are not quantized are
+    returned unchanged.
+    """
+    if not is_quantized(checkpoint):
+        return checkpoint
+    opt = OrderedDict()
+    opt["weight"] = {}
+    for key in checkpoint["quantization"]["order"]:
+        if key in checkpoint["weight_int8"]:
+            opt["weight"][key] = dequantize_tensor(checkpoint["weight_int8"][key], checkpoint["weight_scales"][key])
+        else:
+            opt["weight"][key] = checkpoint["weight_fp16"][key]
+    for key, value in checkpoint.items():
+        if key not in ("weight_fp16", "weight_int8", "weight_scales", "quantization"):
+            opt[key] = value
+    return opt
+
+
+def save_quantized(checkpoint, path):
+    """
+    Save an RVC checkpoint in the compact int8 form (see quantize_checkpoint).
+
+    The file is a regular torch zip archive, but RVC cannot run it directly: load it with
+    load_quantized or blender.load_checkpoint (both dequantize), or convert it back with
+    dequantize_checkpoint. Name it e.g. model.int8.pth
+    so it is not mistaken for a standard model.
+    """
+    torch.save(quantize_checkpoint(checkpoint), path)
+
+
+def load_quantized(path):
+    """Load a compact checkpoint through the checkpoint cache and dequantize it to the standard RVC layout."""
+    return dequantize_checkpoint(cached_load(path))
+
+
+def layer_group(key):
+    """Group name for the error report: the component plus its first submodule, e.g. "dec.ups"."""
+    parts = key.split(".")
+    return ".".join(parts[:2]) if len(parts) > 2 else parts[0]
+
+
+def quantization_report(weights, verbose=True):
+    """
+    Measure the error int8 quantization would introduce, per layer group.
+
+    Args:
+        weights (dict): {key: tensor}, e.g. a blended model's "weight" dict
+        verbose (bool): Print the report as a table
+    Returns:
+        dict: {group: {"layers", "quantized_layers", "params", "fp16_bytes", "compact_bytes",
+               "relative_error", "max_abs_error"}}. relative_error is ||w - dequantized|| / ||w||
+               over all quantized layers of the group (0 when the whole group stays fp16).
+    """
+    report = OrderedDict()
+    sums = {}
+    for key, tensor in weights.items():
+        group = layer_group(key)
+        entry = report.setdefault(group, {"layers": 0, "quantized_layers": 0, "params": 0, "fp16_bytes": 0,
+                                          "compact_bytes": 0, "relative_error": 0.0, "max_abs_error": 0.0})
+        entry["layers"] += 1
+        entry["params"] += tensor.numel()
+        entry["fp16_bytes"] += tensor.numel() * 2
+        if keep_fp16(key, tensor):
+            entry["compact_bytes"] += tensor.numel() * 2
+            continue
+        quantized, scales = quantize_tensor(tensor)
+        reference = tensor.half().float()  # the error on top of what an fp16 blend already stores
+        error = dequantize_tensor(quantized, scales).float() - reference
+        entry["quantized_layers"] += 1
+        entry["compact_bytes"] += quantized.numel() + scales.numel() * 4
+        entry["max_abs_error"] = max(entry["max_abs_error"], error.abs().max().item())
+        error_sq, norm_sq = sums.get(group, (0.0, 0.0))
+        sums[group] = (error_sq + error.pow(2).sum().item(), norm_sq + reference.pow(2).sum().item())
+    for group, (error_sq, norm_sq) in sums.items():
+        report[group]["relative_error"] = math.sqrt(error_sq / norm_sq) if norm_sq else 0.0
+
+    if verbose:
+        print(f"{'group':<24}{'layers':>8}{'int8':>6}{'fp16 MB':>10}{'int8 MB':>10}{'rel. error':>12}{'max abs':>10}")
+        for group, entry in report.items():
+            print(f"{group:<24}{entry['layers']:>8}{entry['quantized_layers']:>6}"
+                  f"{entry['fp16_bytes'] / 1024**2:>10.2f}{entry['compact_bytes'] / 1024**2:>10.2f}"
+                  f"{entry['relative_error']:>12.2e}{entry['max_abs_error']:>10.2e}")
+        fp16_total = sum(entry["fp16_bytes"] for entry in report.values())
+        compact_total = sum(entry["compact_bytes"] for entry in report.values())
+        print(f"Total: {fp16_total / 1024**2:.1f} MB fp16 -> {compact_total / 1024**2:.1f} MB compact")
+    return report
+
+
+if __name__ == "__main__":
+    blend = torch.load("../blends/model.pth", map_location="cpu", weights_only=True)
+    quantization_report(blend["weight"])
+    save_quantized(blend, "../blends/model.int8.pth")
@@ -0,0 +1,154 @@
+import os
+import json
+import mmap
+import struct
+import torch
+from collections import OrderedDict
+from blender import extract
+from checkpoint_cache import cached_load
+from quantized_format import dequantize_checkpoint
+
+
+# safetensors dtype names
+_DTYPES = {
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "F32": torch.float32,
+    "F64": torch.float64,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "I16": torch.int16,
+    "I32": torch.int32,
+    "I64": torch.int64,
+    "BOOL": torch.bool,
+}
+_DTYPE_NAMES = {dtype: name for name, dtype in _DTYPES.items()}
+
+# RVC metadata stored in the header, in .pth order
+METADATA_KEYS = ("config", "sr", "f0", "version", "vocoder", "info")
+
+
+def save_safetensors(checkpoint, path):
+    """
+    Save an RVC checkpoint as a flat safetensors file.
+
+    The tensors of checkpoint["weight"] are stored back to back after a JSON header. The RVC
+    metadata (config, sr, f0, version, vocoder, info) goes in the header's __metadata__ as
+    JSON strings, so the file can also be read with the safetensors library.
+
+    Args:
+        checkpoint (dict): {"weight": {key: tensor}, "config": ..., "sr": ..., ...}
+        path (str): Output path, usually ending in .safetensors
+    """
+    weights = checkpoint["weight"]
+    metadata = {"format": "pt"}
+    for key in METADATA_KEYS:
+        if key in checkpoint:
+            metadata[key] = json.dumps(checkpoint[key])
+
+    header = {"__metadata__": metadata}
+    offset = 0
+    for key, tensor in weights.items():
+        num_bytes = tensor.numel() * tensor.element_size()
+        header[key] = {
+            "dtype": _DTYPE_NAMES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + num_bytes],
+        }
+        offset += num_bytes
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 8)  # keep the data 8-byte aligned
+
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for tensor in weights.values():
+            if tensor.numel():
+                f.write(tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8).numpy())
+
+
+def load_safetensors(path):
+    """
+    Load a safetensors RVC model with memory-mapped, zero-copy tensors.
+
+    The file is mapped copy-on-write: tensors read straight from the page cache, and nothing
+    is copied unless a tensor is modified.
+
+    Args:
+        path (str): Path to the .safetensors file
+    Returns:
+        OrderedDict: {"weight": {key: tensor}, "config": ..., "sr": ..., "f0": ..., "version": ...,
+                     "vocoder": ..., "info": ...}, the same layout as a blended .pth
+    """
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) if os.path.getsize(path) else None
+    data_start = 8 + header_size
+    metadata = header.pop("__metadata__", {})
+
+    opt = OrderedDict()
+    opt["weight"] = {}
+    for key, entry in header.items():
+        dtype = _DTYPES[entry["dtype"]]
+        begin, end = entry["data_offsets"]
+        if end == begin:
+            opt["weight"][key] = torch.empty(entry["shape"], dtype=dtype)
+            continue
+        count = (end - begin) // torch.empty((), dtype=dtype).element_size()
+        tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + begin)
+        opt["weight"][key] = tensor.reshape(entry["shape"])
+    for key in METADATA_KEYS:
+        if key in metadata:
+            opt[key] = json.loads(metadata[key])
+    return opt
+
+
+def pth_to_safetensors(pth_path, safetensors_path=None):
+    """
+    Convert a .pth model (blend or training checkpoint) to safetensors.
+
+    Args:
+        pth_path (str): The .pth file. Training checkpoints are reduced to their inference weights.
+        safetensors_path (str): Output path (default: pth_path with a .safetensors extension)
+    Returns:
+        str: The output path
+    """
+    safetensors_path = safetensors_path or os.path.splitext(pth_path)[0] + ".safetensors"
+    ckpt = torch.load(pth_path, map_location="cpu", weights_only=True, mmap=True)
+    opt = OrderedDict()
+    opt["weight"] = extract(ckpt)["weight"] if "model" in ckpt else ckpt["weight"]
+    for key in METADATA_KEYS:
+        if key in ckpt:
+            opt[key] = ckpt[key]
+    save_safetensors(opt, safetensors_path)
+    print(f"Converted {pth_path} → {safetensors_path}")
+    return safetensors_path
+
+
+def safetensors_to_pth(safetensors_path, pth_path=None):
+    """
+    Convert a safetensors model back to a .pth file for tools that need one.
+
+    Args:
+        safetensors_path (str): The .safetensors file
+        pth_path (str): Output path (default: safetensors_path with a .pth extension)
+    Returns:
+        str: The output path
+    """
+    pth_path = pth_path or os.path.splitext(safetensors_path)[0] + ".pth"
+    torch.save(load_safetensors(safetensors_path), pth_path)
+    print(f"Converted {safetensors_path} → {pth_path}")
+    return pth_path
+
+
+def load_model(path):
+    """
+    Load an RVC model from a .safetensors file, a .pth file or a compact int8 .pth file.
+
+    .pth tensors come from the checkpoint cache and are shared with it, so do not modify
+    them in place (clone them first).
+    """
+    if path.endswith(".safetensors"):
+        return load_safetensors(path)
+    return dequantize_checkpoint(cached_load(path))
@@ -0,0 +1,189 @@
+import os
+import json
+import uuid
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from blender import StreamingCheckpointWriter, extract, load_checkpoint
+from explore_model import read_checkpoint_header
+
+
+# Entries copied to the inference checkpoint besides "weight". Training state (model,
+# optimizer, iteration, learning_rate) is dropped.
+INFERENCE_KEYS = ("config", "sr", "f0", "version", "info", "vocoder")
+
+# Entries RVC cannot load a model without
+REQUIRED_KEYS = ("config", "sr")
+
+
+def training_config(source_path):
+    """
+    Read the inference "config" list and sample rate from the config.json that RVC training
+    writes next to its G_*.pth checkpoints.
+
+    Returns:
+        dict: {"config": [...], "sr": ...}, or {} if there is no config.json
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(source_path)), "config.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        hps = json.load(f)
+    data, model = hps["data"], hps["model"]
+    sr = data.get("sample_rate", data.get("sampling_rate"))
+    config = [
+        data["filter_length"] // 2 + 1, 32, model["inter_channels"], model["hidden_channels"],
+        model["filter_channels"], model["n_heads"], model["n_layers"], model["kernel_size"],
+        model["p_dropout"], model["resblock"], model["resblock_kernel_sizes"],
+        model["resblock_dilation_sizes"], model["upsample_rates"], model["upsample_initial_channel"],
+        model["upsample_kernel_sizes"], model["spk_embed_dim"], model["gin_channels"], sr,
+    ]
+    return {"config": config, "sr": sr}
+
+
+def inference_metadata(source_path, ckpt, metadata=None):
+    """
+    Collect the metadata of the inference checkpoint.
+
+    Values come from the training config.json (see training_config), then the checkpoint's own
+    entries, then metadata, each overriding the previous ones. info defaults to "<iteration>epoch"
+    as in RVC.
+
+    Raises:
+        ValueError: If config or sr cannot be found; the output would not load in RVC
+    """
+    try:
+        opt = training_config(source_path)
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Could not read the training config.json of {source_path}: {error!r}") from error
+    opt.update((key, ckpt[key]) for key in INFERENCE_KEYS if key in ckpt)
+    opt.update(metadata or {})
+    if "info" not in opt and "iteration" in ckpt:
+        opt["info"] = f"{ckpt['iteration']}epoch"
+    missing = [key for key in REQUIRED_KEYS if opt.get(key) is None]
+    if missing:
+        raise ValueError(f"No {' or '.join(missing)} for {source_path}: pass them in metadata, "
+                         "or keep the training config.json next to the checkpoint")
+    return {key: opt[key] for key in INFERENCE_KEYS if key in opt}
+
+
+def _is_training_checkpoint(path):
+    """True if the checkpoint still holds the full training state dict ("model")."""
+    try:
+        return "model" in read_checkpoint_header(path)
+    except ValueError:
+        return "model" in load_checkpoint(path, mmap=True, cache=False)
+
+
+def slim_checkpoint(source_path, output_path, half=True, metadata=None):
+    """
+    Convert one training checkpoint to inference weights.
+
+    The weights go through extract (which drops the enc_q layers) and are written one layer
+    at a time from the memory-mapped source, so memory stays around the size of one layer.
+    Only the entries RVC reads (config, sr, f0, version, info, vocoder) are kept next to the
+    weights; see inference_metadata for where they come from.
+
+    Args:
+        source_path (str): Training checkpoint with a "model" state dict
+        output_path (str): Output .pth path. Written under a temporary name and renamed when complete.
+        half (bool): Store the weights as fp16, like RVC inference weights and blends
+        metadata (dict): Entries to set or override, e.g. {"sr": 40000, "f0": 1, "version": "v2"}
+    Returns:
+        tuple: (source bytes, output bytes)
+    Raises:
+        ValueError: If config or sr cannot be found. Nothing is written.
+    """
+    ckpt = load_checkpoint(source_path, mmap=True, cache=False)
+    opt_metadata = inference_metadata(source_path, ckpt, metadata)
+    temp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    writer = None
+    try:
+        writer = StreamingCheckpointWriter(temp_path)
+        for key, tensor in extract(ckpt)["weight"].items():
+            writer.add_weight(key, tensor.half() if half and tensor.is_floating_point() else tensor)
+        writer.finish(opt_metadata)
+        os.replace(temp_path, output_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return os.path.getsize(source_path), os.path.getsize(output_path)
+
+
+def _slim_job(source_path, output_path, half, metadata):
+    """Convert one file in a worker process, returning (status, sizes or error)."""
+    try:
+        if not _is_training_checkpoint(source_path):
+            return "inference", None
+        return "converted", slim_checkpoint(source_path, output_path, half, metadata)
+    except Exception as error:
+        return "failed", str(error)
+
+
+def slim_checkpoints(source_dir, output_dir, pattern="G_*.pth", workers=4, half=True, metadata=None):
+    """
+    Convert a directory tree of training checkpoints into slim inference checkpoints.
+
+    The tree layout is mirrored into output_dir. Files whose output already exists and is newer
+    than the source are skipped without being opened, so the conversion can be rerun after every
+    training session. Files that are already inference weights are left alone.
+
+    Args:
+        source_dir (str): Folder searched recursively for training checkpoints
+        output_dir (str): Folder for the inference checkpoints. Must not be source_dir.
+        pattern (str): fnmatch pattern of the file names to convert
+        workers (int): Processes converting files at the same time
+        half (bool): Store the weights as fp16 (see slim_checkpoint)
+        metadata (dict): Entries to set or override in every output (see slim_checkpoint).
+                         Files whose config or sr cannot be found are reported as failed.
+    Returns:
+        dict: {"converted": [...], "skipped": [...], "inference": [...], "failed": {path: error},
+               "bytes_before": ..., "bytes_after": ..., "bytes_saved": ...}
+               bytes_* count the converted files only.
+    """
+    jobs = []
+    report = {"converted": [], "skipped": [], "inference": [], "failed": {}}
+    for folder, _, names in os.walk(source_dir):
+        for name in sorted(names):
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            source_path = os.path.join(folder, name)
+            output_path = os.path.join(output_dir, os.path.relpath(source_path, source_dir))
+            if os.path.abspath(output_path) == os.path.abspath(source_path):
+                raise ValueError("output_dir must not be source_dir; the checkpoints would overwrite themselves")
+            if os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(source_path):
+                report["skipped"].append(source_path)
+                continue
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            jobs.append((source_path, output_path))
+
+    bytes_before = bytes_after = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_slim_job, source_path, output_path, half, metadata) for source_path, output_path in jobs]
+            for (source_path, output_path), future in zip(jobs, futures):
+                status, outcome = future.result()
+                if status == "failed":
+                    print(f"Failed to convert {source_path}: {outcome}")
+                    report["failed"][source_path] = outcome
+                elif status == "inference":
+                    report["inference"].append(source_path)
+                else:
+                    before, after = outcome
+                    bytes_before += before
+                    bytes_after += after
+                    report["converted"].append(output_path)
+
+    report["bytes_before"] = bytes_before
+    report["bytes_after"] = bytes_after
+    report["bytes_saved"] = bytes_before - bytes_after
+    print(f"Slimmed {len(report['converted'])} checkpoints ({len(report['skipped'])} already converted, "
+          f"{len(report['inference'])} already inference weights, {len(report['failed'])} failed): "
+          f"{bytes_before / 1024**2:.0f} MB -> {bytes_after / 1024**2:.0f} MB, "
+          f"saved {report['bytes_saved'] / 1024**2:.0f} MB")
+    return report
+
+
+if __name__ == "__main__":
+    slim_checkpoints("/workspace/rvc-cli/logs", "/workspace/slim")
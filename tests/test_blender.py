@@ -0,0 +1,67 @@
+import os
+import zipfile
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from bench_blend import BLEND_RULES, make_synthetic_checkpoint
+from blender import StreamingCheckpointWriter, blend_models
+
+
+@pytest.fixture
+def parents(tmp_path):
+    path1, path2 = str(tmp_path / "a.pth"), str(tmp_path / "b.pth")
+    make_synthetic_checkpoint(path1, size="tiny", seed=1)
+    make_synthetic_checkpoint(path2, size="tiny", seed=2)
+    return {"path": path1, "sid": 0}, {"path": path2, "sid": 0}
+
+
+def test_streamed_blend_matches_in_memory_blend(tmp_path, parents):
+    in_memory, streamed = str(tmp_path / "memory.pth"), str(tmp_path / "stream.pth")
+    assert isinstance(blend_models(in_memory, *parents, BLEND_RULES, 0.3), str)
+    assert isinstance(blend_models(streamed, *parents, BLEND_RULES, 0.3, stream=True), str)
+
+    expected = torch.load(in_memory, map_location="cpu", weights_only=True)
+    actual = torch.load(streamed, map_location="cpu", weights_only=True)
+    assert list(actual) == list(expected)
+    assert list(actual["weight"]) == list(expected["weight"])
+    for key, tensor in expected["weight"].items():
+        assert actual["weight"][key].dtype == tensor.dtype
+        assert actual["weight"][key].shape == tensor.shape
+        assert torch.equal(actual["weight"][key], tensor), key
+    for key in expected:
+        if key != "weight":
+            assert actual[key] == expected[key], key
+
+
+def test_streamed_archive_has_torch_save_records(tmp_path, parents):
+    streamed = str(tmp_path / "stream.pth")
+    blend_models(streamed, *parents, BLEND_RULES, 0.5, stream=True)
+    with zipfile.ZipFile(streamed) as archive:
+        records = {name.split("/", 1)[1] for name in archive.namelist()}
+    assert {"data.pkl", "byteorder", ".data/version"} <= records
+    assert torch.load(streamed, map_location="cpu", weights_only=True, mmap=True)["sr"] == "40k"
+
+
+def test_failed_streamed_blend_leaves_no_file(tmp_path, parents):
+    # Model 2 lacks the last layer, so the blend fails after the writer has written most layers
+    model1, model2 = parents
+    ckpt = torch.load(model2["path"], map_location="cpu", weights_only=True)
+    ckpt["weight"].popitem()
+    truncated = str(tmp_path / "truncated.pth")
+    torch.save(ckpt, truncated)
+
+    streamed = str(tmp_path / "stream.pth")
+    result = blend_models(streamed, model1, {"path": truncated, "sid": 0}, BLEND_RULES, 0.5, stream=True)
+    assert isinstance(result, KeyError)
+    assert not os.path.exists(streamed)
+
+
+def test_writer_close_without_finish(tmp_path):
+    path = str(tmp_path / "partial.pth")
+    writer = StreamingCheckpointWriter(path)
+    writer.add_weight("layer.weight", torch.ones(4, 4).half())
+    writer.close()
+    writer.close()  # closing twice is harmless
+    with pytest.raises(Exception):
+        torch.load(path, map_location="cpu", weights_only=True)